@@ -1,31 +1,78 @@
+import time
+
+# Taken before the other imports, so that the startup profile includes them
+STARTUP_STARTED = time.perf_counter()
+
+import sys
+import instance
+
+# A second launch hands off to the running instance before the imports below
+if __name__ == '__main__' and instance.hand_off(sys.argv):
+    sys.exit(0)
+
 import sqlite3
 import uuid
 import os
-import sys
 import threading
-import webbrowser
-import time
 import platform
 import tempfile
 import atexit
 import socket
-from flask import Flask, request, jsonify, render_template_string, send_from_directory
+import argparse
+import json
+import base64
+import csv
+import io
+import pathlib
+import gzip
+import hashlib
+import bisect
+import math
+import mimetypes
+import zlib
+import re
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from flask import Flask, Response, g, request, jsonify, send_from_directory
+from werkzeug.exceptions import HTTPException
+from werkzeug.wsgi import ClosingIterator
 from flask_cors import CORS
 
-# Try to import system tray functionality
-try:
-    import pystray
-    from pystray import MenuItem as item
-    from PIL import Image, ImageDraw
-    TRAY_AVAILABLE = True
-except ImportError:
-    TRAY_AVAILABLE = False
-    print("System Tray nicht verfügbar. Installieren Sie: pip install pystray Pillow")
+# pystray and Pillow are only imported once the tray is set up, see tray_available()
+TRAY_AVAILABLE = None
+
+# Modules imported on first use; reported by --profile-startup
+DEFERRED_MODULES = ('pystray', 'PIL', 'webbrowser', 'waitress')
+
+def env_number(name, default, parse=float, minimum=None, maximum=None):
+    """Number from the environment variable `name`, `default` if unset, invalid or out of range"""
+    value = os.environ.get(name, '')
+    if not value:
+        return default
+    try:
+        number = parse(value)
+    except ValueError:
+        number = None
+    if (number is None or not math.isfinite(number)
+            or (minimum is not None and number < minimum) or (maximum is not None and number > maximum)):
+        print(f"⚠️  Ungültiger Wert {name}={value!r}, verwende {default}")
+        return default
+    return number
+
+# Time from process start to the first HTTP response checked by the tests
+STARTUP_BUDGET_MS = env_number('BENUTZERVERWALTUNG_STARTUP_BUDGET_MS', 3000.0, minimum=0)
 
 def get_database_path():
     """Get the appropriate database path for the current OS"""
     app_name = "Benutzerverwaltung"
     
+    # Explicit location, e.g. for tests that must not touch the real data
+    override = os.environ.get('BENUTZERVERWALTUNG_DATABASE')
+    if override:
+        override = os.path.abspath(override)
+        os.makedirs(os.path.dirname(override), exist_ok=True)
+        return override
+    
     # Get user's home directory
     home_dir = os.path.expanduser("~")
     
@@ -46,9 +93,40 @@ def get_database_path():
 
 DATABASE = get_database_path()
 
+def get_resource_dir():
+    """Directory holding bundled resources (icons, frontend build)"""
+    if hasattr(sys, '_MEIPASS'):
+        # Running as PyInstaller bundle
+        return sys._MEIPASS
+    # Running as script
+    return os.path.dirname(os.path.abspath(__file__))
+
+# Vite build output, served at / and /assets/ when present
+FRONTEND_DIST_DIR = os.path.join(get_resource_dir(), 'dist')
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+STATIC_MIN_COMPRESS_SIZE = 256
+
+# Server used by run_flask: 'waitress' (production) or 'werkzeug' (development)
+SERVER_MODE = os.environ.get('BENUTZERVERWALTUNG_SERVER', 'waitress')
+# Default of --threads; BENUTZERVERWALTUNG_THREADS overrides it, see env_threads()
+SERVER_THREADS = 8
+# Open event streams (one per browser tab) served on threads of their own
+# next to SERVER_THREADS; --streams or BENUTZERVERWALTUNG_STREAMS
+SERVER_STREAMS = 16
+# --connection-limit or BENUTZERVERWALTUNG_CONNECTION_LIMIT
+SERVER_CONNECTION_LIMIT = 200
+# Seconds an idle (keep-alive) connection stays open;
+# --channel-timeout or BENUTZERVERWALTUNG_CHANNEL_TIMEOUT
+SERVER_CHANNEL_TIMEOUT = 120
+SERVER_MAX_REQUEST_BODY = 64 * 1024 * 1024
+
 # Lock file to prevent multiple instances
 LOCK_FILE = None
 
+# Port the server of this instance is bound to, set in __main__
+SERVER_PORT = None
+
 def create_lock_file():
     """Create a lock file to prevent multiple instances"""
     global LOCK_FILE
@@ -66,17 +144,8 @@ def create_lock_file():
                 with open(lock_path, 'r') as f:
                     pid = int(f.read().strip())
                 
-                # Check if process exists (cross-platform)
-                if platform.system() == "Windows":
-                    import psutil
-                    if psutil.pid_exists(pid):
-                        return False
-                else:
-                    try:
-                        os.kill(pid, 0)  # Signal 0 just checks if process exists
-                        return False
-                    except OSError:
-                        pass  # Process doesn't exist
+                if instance.process_exists(pid):
+                    return False
                 
                 # Remove stale lock file
                 os.remove(lock_path)
@@ -103,14 +172,25 @@ def create_lock_file():
         return True  # Continue anyway
 
 def cleanup_lock_file():
-    """Remove lock file on exit"""
+    """Remove lock file and runtime state on exit"""
     global LOCK_FILE
+    instance.remove_state()
     if LOCK_FILE and os.path.exists(LOCK_FILE):
         try:
             os.remove(LOCK_FILE)
         except OSError:
             pass
 
+def wait_for_running_instance(timeout=instance.FORWARD_TIMEOUT):
+    """Forward "open" to an instance that holds the lock but may still be starting"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reply = instance.forward_command('open')
+        if reply and reply.get('ok'):
+            return reply
+        time.sleep(0.05)
+    return None
+
 def find_available_port(start_port=5000, max_tries=10):
     """Find an available port starting from start_port"""
     for port in range(start_port, start_port + max_tries):
@@ -125,23 +205,1487 @@ def find_available_port(start_port=5000, max_tries=10):
     return None
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'X-Total-Count', 'Link', 'ETag'])
+
+# SQLite tuning applied to every pooled connection
+DB_CACHE_SIZE_KIB = 16384
+DB_MMAP_SIZE = 256 * 1024 * 1024
+DB_BUSY_TIMEOUT_MS = 5000
+DB_POOL_MAX_IDLE = 8
+
+# Pagination settings for the user listing
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Rows fetched per round trip when streaming the export
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv', 'csv'),
+    'json': ('application/json', 'json'),
+}
+
+# Rows copied per transaction when a migration rebuilds the users table
+MIGRATION_BATCH_SIZE = 10000
+
+# UUID versions new user ids can use: 7 (time-ordered, default) or 4 (random)
+USER_ID_VERSIONS = (7, 4)
+
+def env_user_id_version():
+    """UUID version from BENUTZERVERWALTUNG_USER_ID_VERSION, 7 if unset or invalid"""
+    value = os.environ.get('BENUTZERVERWALTUNG_USER_ID_VERSION', '')
+    if not value:
+        return USER_ID_VERSIONS[0]
+    if value.strip() not in [str(version) for version in USER_ID_VERSIONS]:
+        print(f"⚠️  Ungültiger Wert BENUTZERVERWALTUNG_USER_ID_VERSION={value!r}, verwende UUIDv{USER_ID_VERSIONS[0]}")
+        return USER_ID_VERSIONS[0]
+    return int(value)
+
+USER_ID_VERSION = env_user_id_version()
+
+# Size bounds of the in-process response cache
+RESPONSE_CACHE_MAX_ENTRIES = 512
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Server-Sent Events settings for the change feed
+EVENT_HISTORY_SIZE = 1000
+EVENT_HEARTBEAT_SECONDS = 15
+EVENT_RETRY_MS = 3000
+
+# Admission control: concurrent requests and waiting slots per route class
+ADMISSION_LIMITS = {
+    'read': {'concurrency': 32, 'queue': 64},
+    'write': {'concurrency': 4, 'queue': 32},
+    'stream': {'concurrency': 64, 'queue': 0},
+}
+ADMISSION_QUEUE_TIMEOUT = 2.0
+ADMISSION_RETRY_AFTER = 1
+
+# Opt-in statement tracing; slow statements are logged with their query plan
+SQL_TRACE_ENABLED = os.environ.get('BENUTZERVERWALTUNG_SQL_TRACE', '') in ('1', 'true', 'yes')
+SLOW_QUERY_MS = env_number('BENUTZERVERWALTUNG_SLOW_QUERY_MS', 50.0, minimum=0)
+SLOW_QUERY_LOG_SIZE = 200
+# Distinct normalized statements kept in the aggregate
+QUERY_STATS_MAX_STATEMENTS = 1000
+
+# On-demand request profiling; the X-Profile header only counts once enabled
+# here or through POST /api/admin/profiler {"header": true}
+PROFILE_HEADER = 'X-Profile'
+PROFILE_HEADER_ENABLED = os.environ.get('BENUTZERVERWALTUNG_PROFILE_HEADER', '') in ('1', 'true', 'yes')
+PROFILE_MAX_REQUESTS = 100
+PROFILE_MAX_CAPTURES = 50
+
+# Upper bounds in seconds of the request and SQLite time histograms
+METRICS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Compression of API responses; zlib accepts levels -1 (its default) to 9
+API_COMPRESSION_LEVEL = env_number('BENUTZERVERWALTUNG_COMPRESSION_LEVEL', 6, int, -1, 9)
+API_COMPRESSION_MIN_SIZE = 1024
+API_COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/csv')
+# zlib window bits selecting the container format of each encoding
+API_COMPRESSION_WBITS = {'gzip': 31, 'deflate': 15}
+
+# Upper bound for the number of items in one bulk request
+BULK_MAX_ITEMS = 100000
+
+# Result limits for the full-text search
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Set by init_db() once the FTS5 search index is in place
+SEARCH_AVAILABLE = False
+
+# Set by init_db() when SQLite has the JSON functions to encode rows itself
+JSON_SQL_AVAILABLE = False
+
+def user_id_sql(column):
+    """SQL expression for the canonical text form of a stored user id"""
+    groups = [f'substr(hex({column}), {start}, {length})' for start, length in ((1, 8), (9, 4), (13, 4), (17, 4), (21, 12))]
+    text = " || '-' || ".join(groups)
+    return f"CASE WHEN typeof({column}) = 'blob' THEN lower({text}) ELSE {column} END"
+
+# Columns of a user in API form, for rows encoded straight from the cursor
+USER_COLUMNS_SQL = f"{user_id_sql('id')} AS id, vorname, nachname"
+
+# Inserts a user with the next search_rowid, so that like time-ordered ids
+# the FTS5 index and idx_users_search_rowid grow at their right edge
+INSERT_USER_SQL = (
+    'INSERT INTO users (id, vorname, nachname, search_rowid) '
+    'VALUES (?, ?, ?, (SELECT coalesce(max(search_rowid), 0) + 1 FROM users))'
+)
+
+# One user encoded as a JSON object inside SQLite
+USER_JSON_SQL = f"json_object('id', {user_id_sql('id')}, 'vorname', vorname, 'nachname', nachname)"
+
+# German transliterations indexed next to the original spelling, so that
+# "Müller" is found as "Muller", "Müller" and "Mueller"
+GERMAN_FOLDING = [
+    ('ä', 'ae'), ('ö', 'oe'), ('ü', 'ue'),
+    ('Ä', 'Ae'), ('Ö', 'Oe'), ('Ü', 'Ue'),
+    ('ß', 'ss'), ('ẞ', 'SS'),
+]
+
+def search_text_sql(column):
+    """SQL expression for the indexed text of a name column"""
+    folded = column
+    for original, replacement in GERMAN_FOLDING:
+        folded = f"replace({folded}, '{original}', '{replacement}')"
+    return f"CASE WHEN {folded} = {column} THEN {column} ELSE {column} || ' ' || {folded} END"
+
+class UuidV7Generator:
+    """Time-ordered UUIDv7 ids (RFC 9562), monotonic across threads.
+
+    The first 48 bits are the Unix time in milliseconds, so new ids land at
+    the right edge of the primary key B-tree instead of on a random page.
+    Within one millisecond the 12-bit rand_a field is a counter starting at
+    a random value; when it runs over, the timestamp moves on by one
+    millisecond, which also keeps the order when the clock goes backwards.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+    
+    def __call__(self):
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                # Top bit clear, so at least 2048 ids fit into a millisecond
+                self._counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+            else:
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    self._last_ms += 1
+                    self._counter = 0
+            timestamp, counter = self._last_ms, self._counter
+        rand_b = int.from_bytes(os.urandom(8), 'big') & (1 << 62) - 1
+        return uuid.UUID(int=timestamp << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b)
+
+UUID7 = UuidV7Generator()
+
+def new_user_id():
+    """Id of a new user in canonical UUID form, time-ordered unless USER_ID_VERSION is 4"""
+    return str(UUID7() if USER_ID_VERSION == 7 else uuid.uuid4())
+
+def user_id_to_db(user_id):
+    """Stored form of a user id: 16 bytes for a canonical UUID, else the text itself"""
+    if len(user_id) == 36:
+        try:
+            value = uuid.UUID(user_id)
+        except ValueError:
+            return user_id
+        if str(value) == user_id:
+            return value.bytes
+    return user_id
+
+def user_id_from_db(value):
+    """API form of a stored user id"""
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+def user_from_row(row):
+    """API form of a users row"""
+    return {'id': user_id_from_db(row['id']), 'vorname': row['vorname'], 'nachname': row['nachname']}
 
 def init_db():
     with sqlite3.connect(DATABASE) as conn:
+        # WAL lets the read-only pooled connections run next to the writer
+        conn.execute('PRAGMA journal_mode=WAL')
+        migrate_db(conn)
+        init_change_counter(conn)
+        init_search_index(conn)
+        init_json_encoding(conn)
+        conn.commit()
+
+def table_exists(conn, name):
+    """Whether the database has a table of this name"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+def create_users_table(conn, name='users'):
+    """Create the users table in its current layout under the given name.
+
+    Ids are 16-byte BLOBs (legacy ids that are no canonical UUID stay text)
+    and the rows live in the primary key B-tree itself. search_rowid keys
+    the FTS5 index, which needs an integer rowid; INSERT_USER_SQL assigns
+    it in order, the random default only covers rows written by other tools.
+    """
+    conn.execute(f'''
+        CREATE TABLE {name} (
+            id BLOB PRIMARY KEY,
+            vorname TEXT NOT NULL,
+            nachname TEXT NOT NULL,
+            search_rowid INTEGER NOT NULL DEFAULT (random())
+        ) WITHOUT ROWID
+    ''')
+    conn.execute(f'CREATE UNIQUE INDEX idx_users_search_rowid ON {name} (search_rowid)')
+
+def create_users_order_index(conn):
+    # Composite index backing the keyset pagination order
+    conn.execute('CREATE INDEX idx_users_name_order ON users (nachname, vorname, id)')
+
+def create_schema(conn):
+    """Create the tables of a new database at the latest schema version"""
+    conn.execute('BEGIN IMMEDIATE')
+    create_users_table(conn)
+    create_users_order_index(conn)
+    init_users_count(conn)
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.commit()
+
+def migrate_db(conn):
+    """Bring the database schema to SCHEMA_VERSION.
+
+    The version lives in PRAGMA user_version. Every migration sets it in its
+    last transaction, so an interrupted migration is simply run again.
+    """
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f'Datenbank-Schema {version} ist neuer als diese Programmversion ({SCHEMA_VERSION})')
+    if version == 0 and not table_exists(conn, 'users'):
+        create_schema(conn)
+        return
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        started = time.perf_counter()
+        MIGRATIONS[target - 1](conn, target)
+        print(f"🗄️  Datenbank auf Schema {target} migriert ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+def start_users_migration(conn):
+    """Create users_v1 and the triggers that record changes to the legacy rows.
+
+    The triggers are stored in the database, so they also record changes
+    made by other connections or tools between two runs of an interrupted
+    migration.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    if not table_exists(conn, 'users_v1'):
+        create_users_table(conn, 'users_v1')
+    conn.execute('CREATE TABLE IF NOT EXISTS users_v1_changes (legacy_rowid INTEGER PRIMARY KEY)')
+    for event, records in (('INSERT', ['new']), ('UPDATE', ['old', 'new']), ('DELETE', ['old'])):
+        values = ', '.join(f'({record}.rowid)' for record in records)
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS users_v1_track_{event.lower()} AFTER {event} ON users BEGIN
+                INSERT OR IGNORE INTO users_v1_changes (legacy_rowid) VALUES {values};
+            END
+        ''')
+    conn.commit()
+
+def insert_legacy_rows(conn, rows):
+    """Insert (rowid, id, vorname, nachname) rows of the legacy table into users_v1"""
+    conn.executemany(
+        'INSERT INTO users_v1 (id, vorname, nachname, search_rowid) VALUES (?, ?, ?, ?)',
+        [(user_id_to_db(user_id), vorname, nachname, rowid) for rowid, user_id, vorname, nachname in rows]
+    )
+
+def copy_legacy_users(conn, limit=None):
+    """Copy the next rows of the rowid users table into users_v1; returns the count"""
+    last = conn.execute('SELECT max(search_rowid) FROM users_v1').fetchone()[0]
+    query = 'SELECT rowid, id, vorname, nachname FROM users'
+    params = ()
+    if last is not None:
+        query += ' WHERE rowid > ?'
+        params += (last,)
+    query += ' ORDER BY rowid'
+    if limit is not None:
+        query += ' LIMIT ?'
+        params += (limit,)
+    rows = conn.execute(query, params).fetchall()
+    insert_legacy_rows(conn, rows)
+    return len(rows)
+
+def sync_legacy_changes(conn):
+    """Copy again the already copied rows that changed in the legacy table"""
+    last = conn.execute('SELECT max(search_rowid) FROM users_v1').fetchone()[0]
+    if last is not None:
+        rows = conn.execute(
+            'SELECT u.rowid, u.id, u.vorname, u.nachname FROM users_v1_changes c '
+            'JOIN users u ON u.rowid = c.legacy_rowid WHERE c.legacy_rowid <= ?', (last,)
+        ).fetchall()
+        conn.execute(
+            'DELETE FROM users_v1 WHERE search_rowid IN '
+            '(SELECT legacy_rowid FROM users_v1_changes WHERE legacy_rowid <= ?)', (last,)
+        )
+        insert_legacy_rows(conn, rows)
+    # Changed rows after the copied range are read fresh by a later batch
+    conn.execute('DELETE FROM users_v1_changes')
+
+def migrate_users_without_rowid(conn, version):
+    """Move users to a WITHOUT ROWID table with 16-byte BLOB ids.
+
+    The rows are copied in rowid order in batches of MIGRATION_BATCH_SIZE,
+    each in its own short write transaction, so readers keep working and
+    the WAL stays small. Triggers on the legacy table record every insert,
+    update and delete in the meantime, and each batch copies the recorded
+    rows again that it had already copied. An interrupted migration resumes
+    after the last copied row without losing changes made in between. The
+    final transaction catches up on the rest and swaps the tables. The old
+    rowid becomes search_rowid, which keeps the FTS5 index valid.
+    """
+    start_users_migration(conn)
+    while True:
+        conn.execute('BEGIN IMMEDIATE')
+        copied = copy_legacy_users(conn, MIGRATION_BATCH_SIZE)
+        sync_legacy_changes(conn)
+        conn.commit()
+        if copied < MIGRATION_BATCH_SIZE:
+            break
+    
+    conn.execute('BEGIN IMMEDIATE')
+    # Rows written by other connections since the last batch
+    copy_legacy_users(conn)
+    sync_legacy_changes(conn)
+    # Also drops the change triggers
+    conn.execute('DROP TABLE users')
+    conn.execute('DROP TABLE users_v1_changes')
+    conn.execute('ALTER TABLE users_v1 RENAME TO users')
+    create_users_order_index(conn)
+    conn.execute(f'PRAGMA user_version = {version}')
+    conn.commit()
+
+def init_users_count(conn):
+    """Store the number of users in counters and create the triggers that maintain it"""
+    create_counters_table(conn)
+    conn.execute("INSERT OR REPLACE INTO counters (name, value) SELECT 'users_count', COUNT(*) FROM users")
+    for event, operator in (('INSERT', '+'), ('DELETE', '-')):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS users_count_{event.lower()} AFTER {event} ON users BEGIN
+                UPDATE counters SET value = value {operator} 1 WHERE name = 'users_count';
+            END
+        ''')
+
+def migrate_users_count(conn, version):
+    """Add the trigger-maintained users_count counter.
+
+    The one full COUNT(*) runs in the same write transaction that creates
+    the triggers, so no insert or delete can slip in between.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    init_users_count(conn)
+    conn.execute(f'PRAGMA user_version = {version}')
+    conn.commit()
+
+# Schema migrations in order; migration n brings user_version from n - 1 to n
+MIGRATIONS = [
+    migrate_users_without_rowid,
+    migrate_users_count,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def init_json_encoding(conn):
+    """Check whether rows can be encoded to JSON inside SQLite"""
+    global JSON_SQL_AVAILABLE
+    try:
+        conn.execute("SELECT json_object('id', 1)").fetchone()
+    except sqlite3.OperationalError as e:
+        JSON_SQL_AVAILABLE = False
+        print(f"⚠️  JSON-Funktionen in SQLite nicht verfügbar: {e}")
+        return
+    JSON_SQL_AVAILABLE = True
+
+def create_counters_table(conn):
+    """Create the table of the counters that triggers maintain"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+
+def init_change_counter(conn):
+    """Create the users_version counter that triggers bump on every change"""
+    create_counters_table(conn)
+    conn.execute("INSERT OR IGNORE INTO counters (name, value) VALUES ('users_version', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS users_version_{event.lower()} AFTER {event} ON users BEGIN
+                UPDATE counters SET value = value + 1 WHERE name = 'users_version';
+            END
+        ''')
+
+def init_search_index(conn):
+    """Create the FTS5 index over vorname/nachname and the triggers that sync it.
+
+    The index is contentless and keyed on users.search_rowid, since the
+    WITHOUT ROWID users table has no rowid of its own.
+    """
+    global SEARCH_AVAILABLE
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_fts'"
+    ).fetchone()
+    try:
         conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id TEXT PRIMARY KEY,
-                vorname TEXT NOT NULL,
-                nachname TEXT NOT NULL
+            CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5(
+                vorname, nachname,
+                content='',
+                tokenize='unicode61 remove_diacritics 2'
             )
         ''')
-        conn.commit()
+    except sqlite3.OperationalError as e:
+        SEARCH_AVAILABLE = False
+        print(f"⚠️  Volltextsuche nicht verfügbar (FTS5 fehlt): {e}")
+        return
+    
+    new_vorname, new_nachname = search_text_sql('new.vorname'), search_text_sql('new.nachname')
+    old_vorname, old_nachname = search_text_sql('old.vorname'), search_text_sql('old.nachname')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS users_fts_insert AFTER INSERT ON users BEGIN
+            INSERT INTO users_fts (rowid, vorname, nachname)
+            VALUES (new.search_rowid, {new_vorname}, {new_nachname});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS users_fts_delete AFTER DELETE ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, vorname, nachname)
+            VALUES ('delete', old.search_rowid, {old_vorname}, {old_nachname});
+        END
+    ''')
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS users_fts_update AFTER UPDATE OF vorname, nachname ON users BEGIN
+            INSERT INTO users_fts (users_fts, rowid, vorname, nachname)
+            VALUES ('delete', old.search_rowid, {old_vorname}, {old_nachname});
+            INSERT INTO users_fts (rowid, vorname, nachname)
+            VALUES (new.search_rowid, {new_vorname}, {new_nachname});
+        END
+    ''')
+    if not exists:
+        # Index the rows of databases created before the search existed
+        conn.execute(f'''
+            INSERT INTO users_fts (rowid, vorname, nachname)
+            SELECT search_rowid, {search_text_sql('vorname')}, {search_text_sql('nachname')} FROM users
+        ''')
+    SEARCH_AVAILABLE = True
+
+class SqliteTimer(threading.local):
+    """Time spent in SQLite by the current thread since the last reset"""
+    seconds = 0.0
+
+SQLITE_TIMER = SqliteTimer()
+
+def normalize_sql(sql):
+    """Statement text with literals replaced by ? and whitespace collapsed"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'(?<![\w.])-?\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+class QueryTrace:
+    """Time and rows of one statement execution, collected across fetch calls"""
+    __slots__ = ('sql', 'parameters', 'seconds', 'rows')
+    
+    def __init__(self, sql, parameters, seconds):
+        self.sql = sql
+        self.parameters = parameters
+        self.seconds = seconds
+        self.rows = 0
+
+class QueryTracer:
+    """Aggregates traced statements and keeps a log of slow ones with their plan"""
+    
+    def __init__(self, enabled=SQL_TRACE_ENABLED, slow_ms=SLOW_QUERY_MS):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._normalized = {}
+        self._statements = {}
+        self._slow = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+    
+    def normalize(self, sql):
+        normalized = self._normalized.get(sql)
+        if normalized is None:
+            normalized = normalize_sql(sql)
+            if len(self._normalized) < QUERY_STATS_MAX_STATEMENTS * 4:
+                self._normalized[sql] = normalized
+        return normalized
+    
+    def finish(self, trace, conn=None):
+        """Record a finished execution; conn is used for EXPLAIN QUERY PLAN of slow ones"""
+        statement = self.normalize(trace.sql)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                if len(self._statements) >= QUERY_STATS_MAX_STATEMENTS:
+                    return
+                stats = self._statements[statement] = {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'rows': 0}
+            stats['calls'] += 1
+            stats['total_seconds'] += trace.seconds
+            stats['max_seconds'] = max(stats['max_seconds'], trace.seconds)
+            stats['rows'] += trace.rows
+        
+        if trace.seconds * 1000 >= self.slow_ms:
+            entry = {
+                'at': time.time(),
+                'sql': statement,
+                'ms': round(trace.seconds * 1000, 3),
+                'rows': trace.rows,
+                'plan': self.explain(conn, trace) if conn is not None else None,
+            }
+            with self._lock:
+                self._slow.append(entry)
+            self.write_slow_log(entry)
+    
+    def explain(self, conn, trace):
+        """EXPLAIN QUERY PLAN of a statement, run on the connection that executed it"""
+        if trace.parameters is None:
+            return None
+        try:
+            rows = sqlite3.Connection.execute(conn, 'EXPLAIN QUERY PLAN ' + trace.sql, trace.parameters).fetchall()
+        except sqlite3.Error as e:
+            return [f'EXPLAIN fehlgeschlagen: {e}']
+        return [row[3] for row in rows]
+    
+    def write_slow_log(self, entry):
+        """Append a slow statement to slow_queries.log next to the database"""
+        try:
+            with open(os.path.join(os.path.dirname(os.path.abspath(DATABASE)), 'slow_queries.log'), 'a',
+                      encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        except OSError:
+            pass
+    
+    def configure(self, enabled=None, slow_ms=None):
+        if enabled is not None:
+            self.enabled = enabled
+        if slow_ms is not None:
+            self.slow_ms = slow_ms
+    
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._slow.clear()
+    
+    def snapshot(self, top=20, sort='total_seconds'):
+        with self._lock:
+            statements = [dict(stats, sql=sql) for sql, stats in self._statements.items()]
+            slow = list(self._slow)
+        statements.sort(key=lambda stats: stats[sort], reverse=True)
+        for stats in statements:
+            stats['avg_ms'] = round(stats['total_seconds'] / stats['calls'] * 1000, 3)
+            stats['total_ms'] = round(stats.pop('total_seconds') * 1000, 3)
+            stats['max_ms'] = round(stats.pop('max_seconds') * 1000, 3)
+        return {
+            'enabled': self.enabled,
+            'slow_ms': self.slow_ms,
+            'statements': len(statements),
+            'top': statements[:top],
+            'slow': slow[::-1],
+        }
+
+QUERY_TRACER = QueryTracer()
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor adding the time of execute and fetch calls to SQLITE_TIMER.
+
+    While QUERY_TRACER is enabled it also collects the time and rows of the
+    statement and hands them over once the result is used up.
+    """
+    
+    trace = None
+    
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            SQLITE_TIMER.seconds += elapsed
+            if QUERY_TRACER.enabled:
+                self.trace = QueryTrace(sql, parameters, elapsed)
+                if self.description is None:
+                    self.trace.rows = max(self.rowcount, 0)
+                    self._finish_trace()
+    
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            SQLITE_TIMER.seconds += elapsed
+            if QUERY_TRACER.enabled:
+                self.trace = QueryTrace(sql, None, elapsed)
+                self.trace.rows = max(self.rowcount, 0)
+                self._finish_trace()
+    
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - started, 0 if row is None else 1, True)
+        return row
+    
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - started, len(rows), len(rows) < (size or self.arraysize))
+        return rows
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - started, len(rows), True)
+        return rows
+    
+    def _fetched(self, elapsed, rows, done):
+        SQLITE_TIMER.seconds += elapsed
+        if self.trace is not None:
+            self.trace.seconds += elapsed
+            self.trace.rows += rows
+            if done:
+                self._finish_trace()
+    
+    def _finish_trace(self):
+        trace, self.trace = self.trace, None
+        QUERY_TRACER.finish(trace, self.connection)
+    
+    def __del__(self):
+        # Results that were not read to the end; the connection may already
+        # belong to another request, so no query plan is taken
+        if self.trace is not None:
+            trace, self.trace = self.trace, None
+            QUERY_TRACER.finish(trace)
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection that goes back to its pool on close()"""
+    
+    pool = None
+    database = None
+    readonly = False
+    checked_out = False
+    
+    def execute(self, *args):
+        return self.cursor(TimedCursor).execute(*args)
+    
+    def executemany(self, *args):
+        return self.cursor(TimedCursor).executemany(*args)
+    
+    def close(self):
+        if self.pool is None:
+            super().close()
+        elif self.checked_out:
+            self.pool.release(self)
+    
+    def discard(self):
+        """Really close the underlying SQLite connection"""
+        self.pool = None
+        super().close()
+
+class ConnectionPool:
+    """Pool of tuned SQLite connections, separate for read-write and read-only use.
+
+    A connection is handed to one thread at a time and comes back on
+    close(). Idle connections are reused most-recently-released first so
+    their page and statement caches stay warm.
+    """
+    
+    def __init__(self, max_idle=DB_POOL_MAX_IDLE):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = {False: [], True: []}
+        self._stats = {
+            'created': 0,
+            'reused': 0,
+            'discarded': 0,
+            'in_use': 0,
+        }
+    
+    def _open(self, database, readonly):
+        if readonly:
+            uri = pathlib.Path(database).absolute().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   factory=PooledConnection)
+        else:
+            conn = sqlite3.connect(database, check_same_thread=False,
+                                   factory=PooledConnection)
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{DB_CACHE_SIZE_KIB}')
+        conn.execute(f'PRAGMA mmap_size={DB_MMAP_SIZE}')
+        conn.execute(f'PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.row_factory = sqlite3.Row
+        conn.database = database
+        conn.readonly = readonly
+        return conn
+    
+    def acquire(self, readonly=False):
+        """Check out a connection to the current DATABASE"""
+        database = DATABASE
+        with self._lock:
+            idle = self._idle[readonly]
+            while idle:
+                conn = idle.pop()
+                if conn.database == database:
+                    self._stats['reused'] += 1
+                    self._stats['in_use'] += 1
+                    conn.checked_out = True
+                    return conn
+                self._stats['discarded'] += 1
+                conn.discard()
+            self._stats['created'] += 1
+            self._stats['in_use'] += 1
+        try:
+            conn = self._open(database, readonly)
+        except Exception:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            raise
+        conn.pool = self
+        conn.checked_out = True
+        return conn
+    
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted"""
+        conn.checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.discard()
+            with self._lock:
+                self._stats['in_use'] -= 1
+                self._stats['discarded'] += 1
+            return
+        with self._lock:
+            self._stats['in_use'] -= 1
+            idle = self._idle[conn.readonly]
+            if len(idle) < self.max_idle and conn.database == DATABASE:
+                idle.append(conn)
+                return
+            self._stats['discarded'] += 1
+        conn.discard()
+    
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle = self._idle[False] + self._idle[True]
+            self._idle = {False: [], True: []}
+        for conn in idle:
+            conn.discard()
+    
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle_readwrite'] = len(self._idle[False])
+            stats['idle_readonly'] = len(self._idle[True])
+        stats['max_idle'] = self.max_idle
+        return stats
+
+DB_POOL = ConnectionPool()
+atexit.register(DB_POOL.close_all)
+
+def get_db_connection(readonly=False):
+    """Check out a pooled connection; close() returns it to the pool"""
+    return DB_POOL.acquire(readonly)
+
+def encode_cursor(user):
+    """Encode the sort key of a user as an opaque pagination cursor"""
+    key = json.dumps([user['nachname'], user['vorname'], user['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a pagination cursor into its (nachname, vorname, id) sort key"""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise ValueError('Ungültiger Cursor')
+    if not isinstance(key, list) or len(key) != 3 or not all(isinstance(part, str) for part in key):
+        raise ValueError('Ungültiger Cursor')
+    return tuple(key)
+
+def cursor_to_db(after):
+    """Bind parameters of a decoded cursor, with the id in its stored form"""
+    if after is None:
+        return None
+    nachname, vorname, user_id = after
+    return nachname, vorname, user_id_to_db(user_id)
+
+def parse_page_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse the limit query parameter, clamped to `maximum`"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('Ungültiges Limit')
+    if limit < 1:
+        raise ValueError('Ungültiges Limit')
+    return min(limit, maximum)
+
+def get_users_version(conn):
+    """Current value of the users change counter"""
+    return conn.execute("SELECT value FROM counters WHERE name = 'users_version'").fetchone()[0]
+
+def get_users_count(conn):
+    """Number of users, kept up to date by the users_count triggers"""
+    return conn.execute("SELECT value FROM counters WHERE name = 'users_count'").fetchone()[0]
+
+def users_etag(conn):
+    """Strong ETag for user data, derived from the change counter"""
+    return f'users-{get_users_version(conn)}'
+
+def not_modified(etag):
+    """Return a 304 response if the client already has this version, else None"""
+    # Compressed responses carry the ETag with the encoding appended
+    for candidate in [etag] + [f'{etag}-{encoding}' for encoding in API_COMPRESSION_WBITS]:
+        if request.if_none_match.contains_weak(candidate):
+            response = Response(status=304)
+            response.set_etag(candidate)
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+    return None
+
+def build_search_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+def search_users(conn, text, limit):
+    """Find users by name prefix, best bm25 rank first"""
+    query = build_search_query(text)
+    if not query:
+        return []
+    rows = conn.execute('''
+        SELECT u.id, u.vorname, u.nachname
+        FROM (
+            SELECT rowid, rank FROM users_fts
+            WHERE users_fts MATCH ?
+            ORDER BY rank LIMIT ?
+        ) AS hits
+        JOIN users u ON u.search_rowid = hits.rowid
+        ORDER BY hits.rank, u.nachname, u.vorname, u.id
+    ''', (query, limit)).fetchall()
+    return [user_from_row(row) for row in rows]
+
+def fetch_users_page(conn, limit, after=None):
+    """Fetch one page of users in (nachname, vorname, id) order.
+
+    Returns the users of the page, the cursor of the next page and the sort
+    key of the first row after the page (both None on the last page). The
+    seek on the composite index keeps the lookup time independent of how
+    deep the page is.
+    """
+    after = cursor_to_db(after)
+    if after is None:
+        rows = conn.execute(
+            'SELECT id, vorname, nachname FROM users '
+            'ORDER BY nachname, vorname, id LIMIT ?',
+            (limit + 1,)
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            'SELECT id, vorname, nachname FROM users '
+            'WHERE (nachname, vorname, id) > (?, ?, ?) '
+            'ORDER BY nachname, vorname, id LIMIT ?',
+            (*after, limit + 1)
+        ).fetchall()
+    users = [user_from_row(row) for row in rows[:limit]]
+    if len(rows) > limit:
+        return users, encode_cursor(users[-1]), user_sort_key(user_from_row(rows[limit]))
+    return users, None, None
+
+def fetch_users_page_json(conn, limit, after=None):
+    """Like fetch_users_page(), but returns the page as an encoded JSON array.
+
+    SQLite encodes every row with json_object(), so the page is joined from
+    ready-made fragments without building a dict per user or walking the
+    list again in the JSON encoder.
+    """
+    after = cursor_to_db(after)
+    if after is None:
+        rows = conn.execute(
+            f'SELECT {USER_JSON_SQL} AS json, id, vorname, nachname FROM users '
+            'ORDER BY nachname, vorname, id LIMIT ?',
+            (limit + 1,)
+        ).fetchall()
+    else:
+        rows = conn.execute(
+            f'SELECT {USER_JSON_SQL} AS json, id, vorname, nachname FROM users '
+            'WHERE (nachname, vorname, id) > (?, ?, ?) '
+            'ORDER BY nachname, vorname, id LIMIT ?',
+            (*after, limit + 1)
+        ).fetchall()
+    body = ('[' + ','.join([row[0] for row in rows[:limit]]) + ']').encode('utf-8')
+    if len(rows) > limit:
+        return body, encode_cursor(user_from_row(rows[limit - 1])), user_sort_key(user_from_row(rows[limit]))
+    return body, None, None
+
+def sort_key(nachname, vorname, user_id):
+    """Sort key in the listing order, comparing like SQLite orders the rows.
+
+    SQLite sorts TEXT before BLOB, so legacy text ids come before the UUIDs
+    stored as 16 bytes; among UUIDs the canonical strings sort like the bytes.
+    """
+    return (nachname, vorname, (isinstance(user_id_to_db(user_id), bytes), user_id))
+
+def user_sort_key(user):
+    """Sort key of a user (in API form) in the listing order"""
+    return sort_key(user['nachname'], user['vorname'], user['id'])
+
+class ResponseCache:
+    """LRU cache of encoded user listings and single-user reads.
+
+    Every listing page remembers the range of sort keys it depends on, from
+    its cursor up to the first row after it. A write only drops the pages
+    whose range contains the old or new key of the changed user. Entries
+    are also tied to the ETag they were built under, because a reader can
+    see a new version before the writer has invalidated, and an old body
+    must not go out under the new ETag. The writer reads the ETag before
+    and after its change in the write transaction and moves the surviving
+    entries to the new one; a change made by another process leaves them
+    under the old ETag, where they only miss.
+    """
+    
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+    
+    def generation(self):
+        """Token to pass to put(); taken before reading from the database"""
+        with self._lock:
+            return self._generation
+    
+    def get(self, key, etag=None):
+        """Entry stored under `key`; one built under another ETag counts as a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['etag'] != etag:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry
+    
+    def put(self, key, body, headers=None, key_range=None, user_id=None, generation=None, etag=None):
+        """Store an encoded body unless an invalidation happened since `generation`"""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        entry = {
+            'body': body,
+            'headers': headers or {},
+            'range': key_range,
+            'user_id': user_id,
+            'etag': etag,
+        }
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous['body'])
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted['body'])
+                self._stats['evictions'] += 1
+    
+    def invalidate_user(self, user_id, sort_keys, etag=None, new_etag=None):
+        """Drop the entries affected by a change of one user.
+
+        The change took the data from `etag` to `new_etag`; entries built
+        under `etag` that it does not affect are still valid under `new_etag`.
+        """
+        with self._lock:
+            self._generation += 1
+            stale = []
+            for key, entry in self._entries.items():
+                if entry['user_id'] is not None:
+                    if entry['user_id'] == user_id:
+                        stale.append(key)
+                        continue
+                elif entry['range'] is not None:
+                    start, end = entry['range']
+                    if any((start is None or sort_key > start) and (end is None or sort_key <= end)
+                           for sort_key in sort_keys):
+                        stale.append(key)
+                        continue
+                if etag is not None and entry['etag'] == etag:
+                    entry['etag'] = new_etag
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key)['body'])
+            self._stats['invalidations'] += len(stale)
+    
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+RESPONSE_CACHE = ResponseCache()
+
+def fetch_user_sort_key(conn, user_id):
+    """Sort key of a stored user, or None if it does not exist"""
+    row = conn.execute('SELECT vorname, nachname FROM users WHERE id = ?', (user_id_to_db(user_id),)).fetchone()
+    return sort_key(row['nachname'], row['vorname'], user_id) if row else None
+
+class EventBroker:
+    """Fan-out of user change events to the Server-Sent Events streams.
+
+    Event ids are "<boot id>-<sequence>", so a client reconnecting with a
+    Last-Event-ID from an earlier process or from beyond the kept history
+    is told to reload instead of silently missing events.
+    """
+    
+    def __init__(self, history_size=EVENT_HISTORY_SIZE):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._condition = threading.Condition()
+        self._history = deque(maxlen=history_size)
+        self._sequence = 0
+        self._subscribers = 0
+        self._listeners = []
+    
+    def publish(self, event_type, data):
+        with self._condition:
+            self._sequence += 1
+            self._history.append((self._sequence, event_type, json.dumps(data)))
+            self._condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+    
+    def add_listener(self, listener):
+        """Call `listener()` after every publish, e.g. to wake an async stream"""
+        with self._condition:
+            self._listeners.append(listener)
+    
+    def remove_listener(self, listener):
+        with self._condition:
+            self._listeners.remove(listener)
+    
+    def current(self):
+        with self._condition:
+            return self._sequence
+    
+    def parse_event_id(self, event_id):
+        """Sequence number of an event id from this process, else None"""
+        boot_id, _, sequence = (event_id or '').partition('-')
+        if boot_id != self.boot_id or not sequence.isdigit():
+            return None
+        return int(sequence)
+    
+    def _events_after(self, after):
+        if after > self._sequence:
+            return None
+        if self._history and self._history[0][0] > after + 1:
+            return None
+        return [event for event in self._history if event[0] > after]
+    
+    def events_after(self, after):
+        """Events newer than `after`; None if some of them are no longer kept"""
+        with self._condition:
+            return self._events_after(after)
+    
+    def wait_for_events(self, after, timeout):
+        """Like events_after(), but wait up to `timeout` seconds for new events"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > after, timeout)
+            return self._events_after(after)
+    
+    def open_stream(self, last_event_id=None):
+        """Start position and first chunk of a new stream"""
+        preamble = f'retry: {EVENT_RETRY_MS}\n\n'
+        after = self.current()
+        if last_event_id:
+            resumed = self.parse_event_id(last_event_id)
+            if resumed is None:
+                preamble += f'id: {self.boot_id}-{after}\nevent: reset\ndata: {{}}\n\n'
+            else:
+                after = resumed
+        return after, preamble
+    
+    def render(self, after, events):
+        """New stream position and text for a result of events_after()"""
+        if events is None:
+            after = self.current()
+            return after, f'id: {self.boot_id}-{after}\nevent: reset\ndata: {{}}\n\n'
+        if not events:
+            return after, ': heartbeat\n\n'
+        return events[-1][0], ''.join(
+            f'id: {self.boot_id}-{sequence}\nevent: {event_type}\ndata: {data}\n\n'
+            for sequence, event_type, data in events
+        )
+    
+    def stream(self, last_event_id=None):
+        """Generate the text/event-stream body for one subscriber"""
+        with self._condition:
+            self._subscribers += 1
+        try:
+            after, preamble = self.open_stream(last_event_id)
+            yield preamble
+            while True:
+                after, chunk = self.render(after, self.wait_for_events(after, EVENT_HEARTBEAT_SECONDS))
+                yield chunk
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+    
+    def stats(self):
+        with self._condition:
+            return {
+                'boot_id': self.boot_id,
+                'last_event': self._sequence,
+                'history': len(self._history),
+                'subscribers': self._subscribers + len(self._listeners),
+            }
+
+EVENTS = EventBroker()
+
+class AdmissionLane:
+    """Bounded number of in-flight requests with a bounded waiting queue"""
+    
+    def __init__(self, name, concurrency, queue, timeout=ADMISSION_QUEUE_TIMEOUT):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._stats = {'admitted': 0, 'rejected': 0, 'timed_out': 0, 'max_waiting': 0}
+    
+    def try_enter(self):
+        """Take a slot, waiting in the queue if there is room; False means reject"""
+        with self._condition:
+            if self._in_flight >= self.concurrency:
+                if self._waiting >= self.queue:
+                    self._stats['rejected'] += 1
+                    return False
+                self._waiting += 1
+                self._stats['max_waiting'] = max(self._stats['max_waiting'], self._waiting)
+                admitted = self._condition.wait_for(lambda: self._in_flight < self.concurrency,
+                                                    self.timeout)
+                self._waiting -= 1
+                if not admitted:
+                    self._stats['timed_out'] += 1
+                    return False
+            self._in_flight += 1
+            self._stats['admitted'] += 1
+            return True
+    
+    def leave(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+    
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['in_flight'] = self._in_flight
+            stats['waiting'] = self._waiting
+        stats['concurrency'] = self.concurrency
+        stats['queue'] = self.queue
+        return stats
+
+ADMISSION_LANES = {
+    name: AdmissionLane(name, limits['concurrency'], limits['queue'])
+    for name, limits in ADMISSION_LIMITS.items()
+}
+
+def admission_lane_name(path, method):
+    """Route class of a request; None for the reserved, never rejected lane"""
+    if (method == 'OPTIONS' or path in ('/api/health', '/api/metrics')
+            or path.startswith('/api/admin/')):
+        return None
+    if path == '/api/events':
+        return 'stream'
+    if method in ('GET', 'HEAD'):
+        return 'read'
+    return 'write'
+
+class RequestMetrics:
+    """Latency and SQLite time histograms, byte counters and in-flight gauges per route"""
+    
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._sqlite = {}
+        self._bytes = {}
+        self._in_flight = {}
+    
+    def _observe(self, histograms, labels, value):
+        histogram = histograms.get(labels)
+        if histogram is None:
+            histogram = histograms[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        histogram[0][bisect.bisect_left(self.buckets, value)] += 1
+        histogram[1] += value
+    
+    def started(self, route):
+        with self._lock:
+            self._in_flight[route] = self._in_flight.get(route, 0) + 1
+    
+    def finished(self, route, method, status, seconds, sqlite_seconds, bytes_in, bytes_out):
+        with self._lock:
+            self._in_flight[route] -= 1
+            self._observe(self._requests, (route, method, str(status)), seconds)
+            self._observe(self._sqlite, (route, method), sqlite_seconds)
+            counters = self._bytes.setdefault(route, [0, 0])
+            counters[0] += bytes_in
+            counters[1] += bytes_out
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            requests = {labels: (list(counts), total) for labels, (counts, total) in self._requests.items()}
+            sqlite = {labels: (list(counts), total) for labels, (counts, total) in self._sqlite.items()}
+            byte_counters = {route: list(counters) for route, counters in self._bytes.items()}
+            in_flight = dict(self._in_flight)
+        
+        lines = []
+        self._render_histogram(lines, 'benutzerverwaltung_http_request_duration_seconds',
+                               'Time from request start to the end of the response body',
+                               ('route', 'method', 'status'), requests)
+        self._render_histogram(lines, 'benutzerverwaltung_sqlite_seconds_per_request',
+                               'Time spent in SQLite statements per request',
+                               ('route', 'method'), sqlite)
+        for index, (name, help_text) in enumerate([
+            ('benutzerverwaltung_http_request_bytes_total', 'Request body bytes received'),
+            ('benutzerverwaltung_http_response_bytes_total', 'Response body bytes sent'),
+        ]):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for route, counters in sorted(byte_counters.items()):
+                lines.append(f'{name}{{route="{metric_label(route)}"}} {counters[index]}')
+        name = 'benutzerverwaltung_http_requests_in_flight'
+        lines.append(f'# HELP {name} Requests currently being handled or streamed')
+        lines.append(f'# TYPE {name} gauge')
+        for route, count in sorted(in_flight.items()):
+            lines.append(f'{name}{{route="{metric_label(route)}"}} {count}')
+        return '\n'.join(lines) + '\n'
+    
+    def _render_histogram(self, lines, name, help_text, label_names, histograms):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for labels, (counts, total) in sorted(histograms.items()):
+            label_text = ','.join(f'{key}="{metric_label(value)}"' for key, value in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{label_text}}} {total:.6f}')
+            lines.append(f'{name}_count{{{label_text}}} {cumulative}')
+
+def metric_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+METRICS = RequestMetrics()
+
+class MeteredBody:
+    """Response body iterator that counts the bytes sent and reports on close()"""
+    
+    def __init__(self, source, on_close):
+        self.source = iter(source)
+        self.closable = source
+        self.on_close = on_close
+        self.sent = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        chunk = next(self.source)
+        self.sent += len(chunk)
+        return chunk
+    
+    def close(self):
+        try:
+            if hasattr(self.closable, 'close'):
+                self.closable.close()
+        finally:
+            if self.on_close is not None:
+                self.on_close(self.sent)
+                self.on_close = None
+
+def request_route():
+    """Route pattern of the current request, so labels stay bounded"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def start_request_metrics():
+    # Registered before the other hooks so rejected requests are measured too
+    route = request_route()
+    METRICS.started(route)
+    SQLITE_TIMER.seconds = 0.0
+    g.metrics = (route, time.perf_counter())
+
+@app.after_request
+def record_request_metrics(response):
+    # Runs after the other after_request hooks, on the compressed body
+    route, started = g.pop('metrics')
+    method, status = request.method, response.status_code
+    bytes_in = request.content_length or 0
+    
+    def finish(bytes_out):
+        METRICS.finished(route, method, status, time.perf_counter() - started,
+                         SQLITE_TIMER.seconds, bytes_in, bytes_out)
+    
+    if response.is_streamed:
+        response.response = MeteredBody(response.response, finish)
+    else:
+        finish(response.calculate_content_length() or 0)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    # after_request is skipped when a response could not be built at all
+    metrics = g.pop('metrics', None)
+    if metrics is not None:
+        route, started = metrics
+        METRICS.finished(route, request.method, 500, time.perf_counter() - started,
+                         SQLITE_TIMER.seconds, request.content_length or 0, 0)
+
+# Cleared while the database is initialized next to the starting server
+DATABASE_READY = threading.Event()
+DATABASE_READY.set()
+DATABASE_READY_TIMEOUT = 30.0
+# Message of a failed init_db(), e.g. a schema newer than this version
+DATABASE_ERROR = None
+
+@app.before_request
+def wait_for_database():
+    """Hold requests that arrive before init_db() has finished"""
+    if not DATABASE_READY.is_set() and not DATABASE_READY.wait(DATABASE_READY_TIMEOUT):
+        response = jsonify({'error': 'Datenbank wird noch initialisiert'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(ADMISSION_RETRY_AFTER)
+        return response
+    if DATABASE_ERROR is not None:
+        # Never read or write a database whose schema is not understood
+        return jsonify({'error': f'Datenbank nicht verfügbar: {DATABASE_ERROR}'}), 503
+    return None
+
+@app.before_request
+def admit_request():
+    name = admission_lane_name(request.path, request.method)
+    if name is None:
+        return None
+    lane = ADMISSION_LANES[name]
+    if not lane.try_enter():
+        response = jsonify({'error': 'Server ausgelastet, bitte später erneut versuchen'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(ADMISSION_RETRY_AFTER)
+        return response
+    g.admission_lane = lane
+    return None
 
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    return conn
+@app.after_request
+def hold_admission_while_streaming(response):
+    # Streamed bodies are sent after the request context is gone, so the
+    # slot is released when the server closes the response iterator
+    if response.is_streamed and 'admission_lane' in g:
+        response.response = ClosingIterator(response.response, g.pop('admission_lane').leave)
+    return response
+
+@app.teardown_request
+def release_admission(error=None):
+    lane = g.pop('admission_lane', None)
+    if lane is not None:
+        lane.leave()
+
+class CompressionStats:
+    """Bytes before/after compression and CPU time spent, per route"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+    
+    def record(self, route, compressed, bytes_in=0, bytes_out=0, cpu_seconds=0.0):
+        with self._lock:
+            stats = self._routes.setdefault(route, {
+                'compressed': 0, 'skipped': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0,
+            })
+            stats['compressed' if compressed else 'skipped'] += 1
+            stats['bytes_in'] += bytes_in
+            stats['bytes_out'] += bytes_out
+            stats['cpu_seconds'] += cpu_seconds
+    
+    def snapshot(self):
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+        for stats in routes.values():
+            stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+            stats['ratio'] = round(stats['bytes_out'] / stats['bytes_in'], 4) if stats['bytes_in'] else None
+            stats['cpu_seconds'] = round(stats['cpu_seconds'], 6)
+        return {'level': API_COMPRESSION_LEVEL, 'min_size': API_COMPRESSION_MIN_SIZE, 'routes': routes}
+
+COMPRESSION_STATS = CompressionStats()
+
+def compress_stream(source, compressor, route):
+    """Compress a streamed body chunk by chunk, flushing after every chunk"""
+    bytes_in = bytes_out = 0
+    cpu_seconds = 0.0
+    try:
+        for chunk in source:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            started = time.thread_time()
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            cpu_seconds += time.thread_time() - started
+            bytes_in += len(chunk)
+            bytes_out += len(data)
+            if data:
+                yield data
+        data = compressor.flush()
+        bytes_out += len(data)
+        yield data
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+        COMPRESSION_STATS.record(route, True, bytes_in, bytes_out, cpu_seconds)
+
+@app.after_request
+def compress_api_response(response):
+    if (not request.path.startswith('/api/') or response.status_code < 200
+            or response.status_code in (204, 304) or 'Content-Encoding' in response.headers
+            or response.mimetype not in API_COMPRESSIBLE_TYPES):
+        return response
+    
+    encoding = next((encoding for encoding in API_COMPRESSION_WBITS
+                     if request.accept_encodings[encoding]), None)
+    if encoding is None:
+        return response
+    
+    route = request.url_rule.rule if request.url_rule else request.path
+    compressor = zlib.compressobj(API_COMPRESSION_LEVEL, zlib.DEFLATED, API_COMPRESSION_WBITS[encoding])
+    if response.is_streamed:
+        response.response = compress_stream(response.response, compressor, route)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < API_COMPRESSION_MIN_SIZE:
+            COMPRESSION_STATS.record(route, False)
+            return response
+        started = time.thread_time()
+        compressed = compressor.compress(body) + compressor.flush()
+        COMPRESSION_STATS.record(route, True, len(body), len(compressed), time.thread_time() - started)
+        response.set_data(compressed)
+    
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
 
 # HTML Template (embedded to avoid file dependencies)
 HTML_TEMPLATE = '''
@@ -229,6 +1773,14 @@ HTML_TEMPLATE = '''
         .btn:hover {
             opacity: 0.8;
         }
+        .search-input {
+            width: calc(100% - 40px);
+            margin: 0 20px 20px;
+            padding: 10px;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            font-size: 16px;
+        }
         .users-table {
             background: white;
             border-radius: 8px;
@@ -323,6 +1875,7 @@ HTML_TEMPLATE = '''
             </div>
             <div class="users-table">
                 <h2 id="users-count">Benutzer</h2>
+                <input type="search" id="search" class="search-input" placeholder="Nach Vor- oder Nachname suchen...">
                 <div id="users-list"></div>
             </div>
         </div>
@@ -332,6 +1885,8 @@ HTML_TEMPLATE = '''
         let editingId = null;
         
         const API_BASE = '/api';
+        const PAGE_SIZE = 100;
+        const SEARCH_LIMIT = 50;
         
         function showMessage(text, type) {
             const messageDiv = document.getElementById('message');
@@ -341,10 +1896,50 @@ HTML_TEMPLATE = '''
             }, 3000);
         }
         
+        let users = [];
+        let nextCursor = null;
+        let totalCount = null;
+        
+        let searchQuery = '';
+        let searchTimer = null;
+        
         async function fetchUsers() {
+            users = [];
+            nextCursor = null;
+            if (searchQuery) {
+                await searchUsers();
+            } else {
+                await loadMoreUsers();
+            }
+        }
+        
+        async function searchUsers() {
+            const params = new URLSearchParams({ q: searchQuery, limit: SEARCH_LIMIT });
+            
+            try {
+                const response = await fetch(`${API_BASE}/users/search?${params}`);
+                if (!response.ok) {
+                    throw new Error('search failed');
+                }
+                users = await response.json();
+                displayUsers(users);
+            } catch (error) {
+                showMessage('Fehler bei der Suche', 'error');
+            }
+        }
+        
+        async function loadMoreUsers() {
+            const params = new URLSearchParams({ limit: PAGE_SIZE });
+            if (nextCursor) {
+                params.set('cursor', nextCursor);
+            }
+            
             try {
-                const response = await fetch(`${API_BASE}/users`);
-                const users = await response.json();
+                const response = await fetch(`${API_BASE}/users?${params}`);
+                const page = await response.json();
+                users = users.concat(page);
+                nextCursor = response.headers.get('X-Next-Cursor');
+                totalCount = Number(response.headers.get('X-Total-Count'));
                 displayUsers(users);
             } catch (error) {
                 showMessage('Fehler beim Laden der Benutzer', 'error');
@@ -355,7 +1950,10 @@ HTML_TEMPLATE = '''
             const countElement = document.getElementById('users-count');
             const listElement = document.getElementById('users-list');
             
-            countElement.textContent = `Benutzer (${users.length})`;
+            // The total comes from the server, so it is exact before all pages are loaded
+            countElement.textContent = searchQuery || totalCount === null
+                ? `Benutzer (${users.length})`
+                : `Benutzer (${totalCount})`;
             
             if (users.length === 0) {
                 listElement.innerHTML = '<p style="padding: 20px">Keine Benutzer vorhanden</p>';
@@ -381,6 +1979,9 @@ HTML_TEMPLATE = '''
             });
             
             html += '</tbody></table>';
+            if (nextCursor) {
+                html += '<div style="padding: 20px; text-align: center"><button onclick="loadMoreUsers()" class="btn btn-secondary">Weitere laden</button></div>';
+            }
             listElement.innerHTML = html;
         }
         
@@ -413,7 +2014,6 @@ HTML_TEMPLATE = '''
                 
                 if (response.ok) {
                     showMessage('Benutzer erfolgreich gelöscht', 'success');
-                    fetchUsers();
                 } else {
                     showMessage('Fehler beim Löschen', 'error');
                 }
@@ -451,7 +2051,6 @@ HTML_TEMPLATE = '''
                         'success'
                     );
                     cancelEdit();
-                    fetchUsers();
                 } else {
                     showMessage('Fehler beim Speichern', 'error');
                 }
@@ -462,31 +2061,62 @@ HTML_TEMPLATE = '''
         
         document.getElementById('cancel-btn').addEventListener('click', cancelEdit);
         
+        document.getElementById('search').addEventListener('input', (e) => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                searchQuery = e.target.value.trim();
+                fetchUsers();
+            }, 200);
+        });
+        
         // Load users on page load
         fetchUsers();
         
-        // Connection monitoring
-        let connectionLost = false;
+        // Apply change events from the server instead of reloading the list
+        function compareUsers(a, b) {
+            const left = [a.nachname, a.vorname, a.id];
+            const right = [b.nachname, b.vorname, b.id];
+            for (let i = 0; i < left.length; i++) {
+                if (left[i] !== right[i]) {
+                    return left[i] < right[i] ? -1 : 1;
+                }
+            }
+            return 0;
+        }
         
-        function checkConnection() {
-            fetch('/api/health')
-                .then(response => {
-                    if (response.ok) {
-                        if (connectionLost) {
-                            // Connection restored
-                            document.getElementById('connection-warning').classList.remove('show');
-                            document.body.classList.remove('connection-lost');
-                            connectionLost = false;
-                        }
-                    } else {
-                        showConnectionWarning();
-                    }
-                })
-                .catch(error => {
-                    showConnectionWarning();
-                });
+        function insertUser(user) {
+            // Users sorting after the loaded pages arrive with the next page
+            const last = users[users.length - 1];
+            if (nextCursor && (!last || compareUsers(user, last) > 0)) {
+                return;
+            }
+            const index = users.findIndex(other => compareUsers(user, other) < 0);
+            users.splice(index === -1 ? users.length : index, 0, user);
         }
         
+        function removeUser(id) {
+            users = users.filter(user => user.id !== id);
+        }
+        
+        function applyEvent(type, user) {
+            if (totalCount !== null && type !== 'updated') {
+                totalCount += type === 'created' ? 1 : -1;
+            }
+            if (type === 'deleted') {
+                removeUser(user.id);
+            } else if (searchQuery) {
+                // Search results are ranked by the server; only refresh shown rows
+                users = users.map(other => other.id === user.id ? user : other);
+            } else {
+                removeUser(user.id);
+                insertUser(user);
+            }
+            displayUsers(users);
+        }
+        
+        // Connection monitoring: the open event stream doubles as heartbeat
+        let connectionLost = false;
+        
         function showConnectionWarning() {
             if (!connectionLost) {
                 document.getElementById('connection-warning').classList.add('show');
@@ -495,85 +2125,890 @@ HTML_TEMPLATE = '''
             }
         }
         
-        // Start heartbeat check every 5 seconds
-        setInterval(checkConnection, 5000);
+        function hideConnectionWarning() {
+            if (connectionLost) {
+                document.getElementById('connection-warning').classList.remove('show');
+                document.body.classList.remove('connection-lost');
+                connectionLost = false;
+            }
+        }
         
-        // Initial connection check
-        checkConnection();
+        const events = new EventSource(`${API_BASE}/events`);
+        events.onopen = hideConnectionWarning;
+        events.onerror = showConnectionWarning;
+        ['created', 'updated', 'deleted'].forEach(type => {
+            events.addEventListener(type, (e) => applyEvent(type, JSON.parse(e.data)));
+        });
+        events.addEventListener('reset', () => fetchUsers());
     </script>
 </body>
 </html>
 '''
 
+def compress_variants(body, mimetype):
+    """Precompressed encodings of a static file that are smaller than the original"""
+    variants = {'identity': body}
+    compressible = mimetype.startswith('text/') or mimetype in (
+        'application/javascript', 'application/json', 'image/svg+xml')
+    if not compressible or len(body) < STATIC_MIN_COMPRESS_SIZE:
+        return variants
+    
+    candidates = {'gzip': gzip.compress(body, STATIC_GZIP_LEVEL, mtime=0)}
+    try:
+        import brotli
+        candidates['br'] = brotli.compress(body, quality=STATIC_BROTLI_QUALITY)
+    except ImportError:
+        pass
+    for encoding, compressed in candidates.items():
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+class StaticAsset:
+    """A static file held in memory together with its precompressed variants"""
+    
+    def __init__(self, body, mimetype, cache_control):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.variants = compress_variants(body, mimetype)
+        self.digest = hashlib.sha256(body).hexdigest()[:20]
+    
+    def choose_encoding(self):
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and request.accept_encodings[encoding]:
+                return encoding
+        return 'identity'
+    
+    def response(self):
+        encoding = self.choose_encoding()
+        etag = self.digest if encoding == 'identity' else f'{self.digest}-{encoding}'
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding], mimetype=self.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+STATIC_ASSETS = None
+STATIC_ASSETS_LOCK = threading.Lock()
+
+def load_static_assets():
+    """Render the page and load the Vite build once, keyed by URL path"""
+    assets = {}
+    index_path = os.path.join(FRONTEND_DIST_DIR, 'index.html')
+    if os.path.exists(index_path):
+        with open(index_path, 'rb') as f:
+            page = f.read()
+        assets_dir = os.path.join(FRONTEND_DIST_DIR, 'assets')
+        for root, _, files in os.walk(assets_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                url = '/assets/' + os.path.relpath(path, assets_dir).replace(os.sep, '/')
+                mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+                with open(path, 'rb') as f:
+                    # Vite puts a content hash into every asset file name
+                    assets[url] = StaticAsset(f.read(), mimetype, 'public, max-age=31536000, immutable')
+    else:
+        page = app.jinja_env.from_string(HTML_TEMPLATE).render().encode('utf-8')
+    assets['/'] = StaticAsset(page, 'text/html; charset=utf-8', 'no-cache')
+    return assets
+
+def get_static_assets():
+    global STATIC_ASSETS
+    if STATIC_ASSETS is None:
+        with STATIC_ASSETS_LOCK:
+            if STATIC_ASSETS is None:
+                STATIC_ASSETS = load_static_assets()
+    return STATIC_ASSETS
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    return get_static_assets()['/'].response()
+
+@app.route('/assets/<path:filename>')
+def static_asset(filename):
+    asset = get_static_assets().get(f'/assets/{filename}')
+    if asset is None:
+        return jsonify({'error': 'Datei nicht gefunden'}), 404
+    return asset.response()
 
 @app.route('/api/users', methods=['GET'])
 def get_users():
-    conn = get_db_connection()
-    users = conn.execute('SELECT * FROM users').fetchall()
-    conn.close()
-    return jsonify([dict(user) for user in users])
+    try:
+        limit = parse_page_limit(request.args.get('limit'))
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    cache_key = (DATABASE, 'list', limit, cursor)
+    conn = get_db_connection(readonly=True)
+    try:
+        etag = users_etag(conn)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        total = get_users_count(conn)
+        entry = RESPONSE_CACHE.get(cache_key, etag)
+        if entry is None:
+            generation = RESPONSE_CACHE.generation()
+            if JSON_SQL_AVAILABLE:
+                body, next_cursor, end_key = fetch_users_page_json(conn, limit, after)
+            else:
+                users, next_cursor, end_key = fetch_users_page(conn, limit, after)
+                body = jsonify(users).get_data()
+    finally:
+        conn.close()
+    
+    if entry is None:
+        headers = {}
+        if next_cursor:
+            headers['X-Next-Cursor'] = next_cursor
+            headers['Link'] = f'</api/users?limit={limit}&cursor={next_cursor}>; rel="next"'
+        RESPONSE_CACHE.put(cache_key, body, headers,
+                           key_range=(sort_key(*after) if after else None, end_key), generation=generation,
+                           etag=etag)
+    else:
+        body, headers = entry['body'], entry['headers']
+    
+    response = Response(body, mimetype='application/json')
+    response.headers.update(headers)
+    response.headers['X-Total-Count'] = str(total)
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/users/count', methods=['GET'])
+def count_users():
+    """Number of users from the trigger-maintained counter, without a table scan"""
+    conn = get_db_connection(readonly=True)
+    try:
+        etag = users_etag(conn)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        count = get_users_count(conn)
+    finally:
+        conn.close()
+    
+    response = jsonify({'count': count})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def iter_user_batches(columns=USER_COLUMNS_SQL):
+    """Yield the whole user table in batches straight from the cursor"""
+    conn = get_db_connection(readonly=True)
+    try:
+        cursor = conn.execute(
+            # users.id: a plain "id" would sort by the text form aliased as id
+            f'SELECT {columns} FROM users ORDER BY nachname, vorname, users.id'
+        )
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            yield rows
+    finally:
+        conn.close()
+
+def generate_export(export_format):
+    """Generate the export as text chunks, one chunk per fetched batch"""
+    if export_format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['id', 'vorname', 'nachname'])
+        yield buffer.getvalue()
+        for rows in iter_user_batches():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(tuple(row) for row in rows)
+            yield buffer.getvalue()
+    elif not JSON_SQL_AVAILABLE:
+        for chunk in generate_export_python(export_format):
+            yield chunk
+    elif export_format == 'ndjson':
+        for rows in iter_user_batches(USER_JSON_SQL):
+            yield ''.join([row[0] + '\n' for row in rows])
+    else:
+        yield '['
+        separator = ''
+        for rows in iter_user_batches(USER_JSON_SQL):
+            yield separator + ','.join([row[0] for row in rows])
+            separator = ','
+        yield ']'
+
+def generate_export_python(export_format):
+    """JSON exports encoded in Python, for SQLite builds without JSON functions"""
+    if export_format == 'ndjson':
+        for rows in iter_user_batches():
+            yield ''.join(json.dumps(dict(row)) + '\n' for row in rows)
+    else:
+        yield '['
+        separator = ''
+        for rows in iter_user_batches():
+            chunk = ','.join(json.dumps(dict(row)) for row in rows)
+            yield separator + chunk
+            separator = ','
+        yield ']'
+
+@app.route('/api/users/export', methods=['GET'])
+def export_users():
+    """Stream all users as NDJSON, CSV or JSON with constant memory"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Unbekanntes Exportformat'}), 400
+    
+    mimetype, extension = EXPORT_FORMATS[export_format]
+    response = Response(generate_export(export_format), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=benutzer.{extension}'
+    return response
+
+@app.route('/api/users/search', methods=['GET'])
+def search_users_endpoint():
+    """Full-text prefix search over vorname and nachname"""
+    if not SEARCH_AVAILABLE:
+        return jsonify({'error': 'Volltextsuche nicht verfügbar'}), 503
+    
+    try:
+        limit = parse_page_limit(request.args.get('limit'), SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    conn = get_db_connection(readonly=True)
+    try:
+        users = search_users(conn, request.args.get('q', ''), limit)
+    finally:
+        conn.close()
+    return jsonify(users)
 
 @app.route('/api/users', methods=['POST'])
 def create_user():
     data = request.get_json()
     if not data or 'vorname' not in data or 'nachname' not in data:
         return jsonify({'error': 'Vorname und Nachname sind erforderlich'}), 400
+    if not isinstance(data['vorname'], str) or not isinstance(data['nachname'], str):
+        return jsonify({'error': 'Vorname und Nachname müssen Text sein'}), 400
     
-    user_id = str(uuid.uuid4())
+    user_id = new_user_id()
     conn = get_db_connection()
-    conn.execute('INSERT INTO users (id, vorname, nachname) VALUES (?, ?, ?)',
-                 (user_id, data['vorname'], data['nachname']))
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            etag = users_etag(conn)
+            conn.execute(INSERT_USER_SQL, (user_id_to_db(user_id), data['vorname'], data['nachname']))
+            new_etag = users_etag(conn)
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
+    RESPONSE_CACHE.invalidate_user(user_id, [sort_key(data['nachname'], data['vorname'], user_id)], etag, new_etag)
     
-    return jsonify({'id': user_id, 'vorname': data['vorname'], 'nachname': data['nachname']}), 201
+    user = {'id': user_id, 'vorname': data['vorname'], 'nachname': data['nachname']}
+    EVENTS.publish('created', user)
+    return jsonify(user), 201
+
+@app.route('/api/users/<user_id>', methods=['GET'])
+def get_user(user_id):
+    cache_key = (DATABASE, 'user', user_id)
+    conn = get_db_connection(readonly=True)
+    try:
+        etag = users_etag(conn)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        entry = RESPONSE_CACHE.get(cache_key, etag)
+        if entry is None:
+            generation = RESPONSE_CACHE.generation()
+            user = conn.execute('SELECT id, vorname, nachname FROM users WHERE id = ?',
+                                (user_id_to_db(user_id),)).fetchone()
+    finally:
+        conn.close()
+    
+    if entry is None:
+        if user is None:
+            return jsonify({'error': 'Benutzer nicht gefunden'}), 404
+        response = jsonify(user_from_row(user))
+        RESPONSE_CACHE.put(cache_key, response.get_data(), user_id=user_id, generation=generation, etag=etag)
+    else:
+        response = Response(entry['body'], mimetype='application/json')
+    
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 @app.route('/api/users/<user_id>', methods=['PUT'])
 def update_user(user_id):
     data = request.get_json()
     if not data or 'vorname' not in data or 'nachname' not in data:
         return jsonify({'error': 'Vorname und Nachname sind erforderlich'}), 400
+    if not isinstance(data['vorname'], str) or not isinstance(data['nachname'], str):
+        return jsonify({'error': 'Vorname und Nachname müssen Text sein'}), 400
     
     conn = get_db_connection()
-    result = conn.execute('UPDATE users SET vorname = ?, nachname = ? WHERE id = ?',
-                          (data['vorname'], data['nachname'], user_id))
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            # Read the old sort key and ETag in the same write transaction as the change
+            conn.execute('BEGIN IMMEDIATE')
+            etag = users_etag(conn)
+            old_key = fetch_user_sort_key(conn, user_id)
+            result = conn.execute('UPDATE users SET vorname = ?, nachname = ? WHERE id = ?',
+                                  (data['vorname'], data['nachname'], user_id_to_db(user_id)))
+            new_etag = users_etag(conn)
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
     
     if result.rowcount == 0:
         return jsonify({'error': 'Benutzer nicht gefunden'}), 404
+    RESPONSE_CACHE.invalidate_user(user_id, [old_key, sort_key(data['nachname'], data['vorname'], user_id)],
+                                   etag, new_etag)
     
-    return jsonify({'id': user_id, 'vorname': data['vorname'], 'nachname': data['nachname']})
+    user = {'id': user_id, 'vorname': data['vorname'], 'nachname': data['nachname']}
+    EVENTS.publish('updated', user)
+    return jsonify(user)
 
 @app.route('/api/users/<user_id>', methods=['DELETE'])
 def delete_user(user_id):
     conn = get_db_connection()
-    result = conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            # Read the old sort key and ETag in the same write transaction as the change
+            conn.execute('BEGIN IMMEDIATE')
+            etag = users_etag(conn)
+            old_key = fetch_user_sort_key(conn, user_id)
+            result = conn.execute('DELETE FROM users WHERE id = ?', (user_id_to_db(user_id),))
+            new_etag = users_etag(conn)
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
     
     if result.rowcount == 0:
         return jsonify({'error': 'Benutzer nicht gefunden'}), 404
+    RESPONSE_CACHE.invalidate_user(user_id, [old_key], etag, new_etag)
     
+    EVENTS.publish('deleted', {'id': user_id})
     return jsonify({'message': 'Benutzer gelöscht'})
 
+# Marks NDJSON lines that could not be parsed
+INVALID_JSON = object()
+
+def parse_bulk_body():
+    """Parse a bulk request body sent as JSON array or NDJSON.
+
+    Unparsable NDJSON lines become INVALID_JSON entries so that they get an
+    error result of their own instead of failing the whole request.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(INVALID_JSON)
+        return items
+    
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError('JSON-Array oder NDJSON erwartet')
+    return items
+
+def validate_bulk_user(item, with_id):
+    """Return an error message for an invalid bulk item, or None"""
+    if item is INVALID_JSON:
+        return 'Ungültiges JSON'
+    if not isinstance(item, dict) or 'vorname' not in item or 'nachname' not in item:
+        return 'Vorname und Nachname sind erforderlich'
+    if not isinstance(item['vorname'], str) or not isinstance(item['nachname'], str):
+        return 'Vorname und Nachname müssen Text sein'
+    if with_id and not isinstance(item.get('id'), str):
+        return 'ID ist erforderlich'
+    return None
+
+def bulk_item_id(item):
+    """Extract the user id of a bulk delete item (plain string or object)"""
+    if isinstance(item, str):
+        return item
+    if isinstance(item, dict) and isinstance(item.get('id'), str):
+        return item['id']
+    return None
+
+def bulk_response(results, started):
+    """Build the summary response of a bulk request"""
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for result in results if 'error' not in result)
+    return jsonify({
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'elapsed_ms': round(elapsed * 1000, 3),
+        'rows_per_second': round(succeeded / elapsed) if elapsed > 0 else None,
+        'results': results,
+    })
+
+def load_bulk_items():
+    """Parse the bulk body; returns (items, error response)"""
+    try:
+        items = parse_bulk_body()
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    if len(items) > BULK_MAX_ITEMS:
+        return None, (jsonify({'error': f'Maximal {BULK_MAX_ITEMS} Einträge pro Anfrage'}), 413)
+    return items, None
+
+@app.route('/api/users/bulk', methods=['POST'])
+def bulk_create_users():
+    """Create many users in a single transaction"""
+    started = time.perf_counter()
+    items, error = load_bulk_items()
+    if error:
+        return error
+    
+    results = []
+    rows = []
+    for index, item in enumerate(items):
+        message = validate_bulk_user(item, with_id=False)
+        if message:
+            results.append({'index': index, 'status': 400, 'error': message})
+            continue
+        user_id = new_user_id()
+        rows.append((user_id_to_db(user_id), item['vorname'], item['nachname']))
+        results.append({'index': index, 'status': 201, 'id': user_id})
+    
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.executemany(INSERT_USER_SQL, rows)
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
+    
+    # Bulk writes touch arbitrary key ranges, so drop the whole cache and
+    # let the clients reload instead of replaying one event per row
+    RESPONSE_CACHE.clear()
+    EVENTS.publish('reset', {'reason': 'bulk'})
+    
+    return bulk_response(results, started)
+
+@app.route('/api/users/bulk', methods=['PUT'])
+def bulk_update_users():
+    """Update many users in a single transaction via a temp-table join"""
+    started = time.perf_counter()
+    items, error = load_bulk_items()
+    if error:
+        return error
+    
+    results = [None] * len(items)
+    rows = []
+    for index, item in enumerate(items):
+        message = validate_bulk_user(item, with_id=True)
+        if message:
+            results[index] = {'index': index, 'status': 400, 'error': message}
+        else:
+            rows.append((index, item['id'], user_id_to_db(item['id']), item['vorname'], item['nachname']))
+    
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS bulk_updates (
+                    id BLOB PRIMARY KEY,
+                    vorname TEXT NOT NULL,
+                    nachname TEXT NOT NULL
+                )
+            ''')
+            conn.execute('DELETE FROM temp.bulk_updates')
+            # Later items win when the same id appears more than once
+            conn.executemany('INSERT OR REPLACE INTO temp.bulk_updates (id, vorname, nachname) VALUES (?, ?, ?)',
+                             [row[2:] for row in rows])
+            missing = {row['id'] for row in conn.execute(
+                'SELECT b.id FROM temp.bulk_updates b '
+                'WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = b.id)'
+            )}
+            conn.execute(
+                'UPDATE users SET vorname = b.vorname, nachname = b.nachname '
+                'FROM temp.bulk_updates b WHERE users.id = b.id'
+            )
+            conn.execute('DELETE FROM temp.bulk_updates')
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
+    
+    RESPONSE_CACHE.clear()
+    EVENTS.publish('reset', {'reason': 'bulk'})
+    
+    for index, user_id, db_id, _, _ in rows:
+        if db_id in missing:
+            results[index] = {'index': index, 'status': 404, 'id': user_id, 'error': 'Benutzer nicht gefunden'}
+        else:
+            results[index] = {'index': index, 'status': 200, 'id': user_id}
+    
+    return bulk_response(results, started)
+
+@app.route('/api/users/bulk', methods=['DELETE'])
+def bulk_delete_users():
+    """Delete many users by id in a single transaction via a temp-table join"""
+    started = time.perf_counter()
+    items, error = load_bulk_items()
+    if error:
+        return error
+    
+    results = [None] * len(items)
+    ids = []
+    for index, item in enumerate(items):
+        if item is INVALID_JSON:
+            results[index] = {'index': index, 'status': 400, 'error': 'Ungültiges JSON'}
+            continue
+        user_id = bulk_item_id(item)
+        if user_id is None:
+            results[index] = {'index': index, 'status': 400, 'error': 'ID ist erforderlich'}
+        else:
+            ids.append((index, user_id))
+    
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS bulk_ids (id BLOB PRIMARY KEY)')
+            conn.execute('DELETE FROM temp.bulk_ids')
+            conn.executemany('INSERT OR IGNORE INTO temp.bulk_ids (id) VALUES (?)',
+                             [(user_id_to_db(user_id),) for _, user_id in ids])
+            missing = {row['id'] for row in conn.execute(
+                'SELECT b.id FROM temp.bulk_ids b '
+                'WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = b.id)'
+            )}
+            conn.execute('DELETE FROM users WHERE id IN (SELECT id FROM temp.bulk_ids)')
+            conn.execute('DELETE FROM temp.bulk_ids')
+    except sqlite3.Error as e:
+        return jsonify({'error': f'Datenbankfehler: {e}'}), 500
+    finally:
+        conn.close()
+    
+    RESPONSE_CACHE.clear()
+    EVENTS.publish('reset', {'reason': 'bulk'})
+    
+    for index, user_id in ids:
+        if user_id_to_db(user_id) in missing:
+            results[index] = {'index': index, 'status': 404, 'id': user_id, 'error': 'Benutzer nicht gefunden'}
+        else:
+            results[index] = {'index': index, 'status': 200, 'id': user_id}
+    
+    return bulk_response(results, started)
+
+@app.route('/api/events', methods=['GET'])
+def event_stream():
+    """Server-Sent Events feed of created, updated and deleted users"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    response = Response(EVENTS.stream(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def profile_dir():
+    """Directory of the stored request profiles, next to the database"""
+    return os.path.join(os.path.dirname(os.path.abspath(DATABASE)), 'profiles')
+
+class RequestProfiler:
+    """WSGI middleware running cProfile for armed routes or requests with X-Profile.
+
+    Routing, hooks, the view and the streamed body are all profiled. The
+    header is ignored unless header mode is enabled, so clients cannot
+    write profiles to disk on their own. When nothing is armed a request
+    only pays for one dict lookup.
+    """
+    
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi_app = flask_app.wsgi_app
+        self.header_key = 'HTTP_' + PROFILE_HEADER.upper().replace('-', '_')
+        self.armed = {}
+        self.header_enabled = PROFILE_HEADER_ENABLED
+        self._lock = threading.Lock()
+        # cProfile allows one active profiler per process on newer Pythons
+        self._active = threading.Lock()
+    
+    def arm(self, route, count):
+        with self._lock:
+            self.armed[route] = count
+    
+    def disarm(self):
+        with self._lock:
+            self.armed.clear()
+    
+    def _claim(self, environ):
+        """Route pattern to profile this request for, counting down armed routes"""
+        try:
+            rule, _ = self.flask_app.url_map.bind_to_environ(environ).match(return_rule=True)
+            route = rule.rule
+        except HTTPException:
+            route = 'unmatched'
+        if self.header_enabled and environ.get(self.header_key):
+            return route
+        with self._lock:
+            remaining = self.armed.get(route)
+            if not remaining:
+                return None
+            if remaining == 1:
+                del self.armed[route]
+            else:
+                self.armed[route] = remaining - 1
+        return route
+    
+    def __call__(self, environ, start_response):
+        if not self.armed and not (self.header_enabled and self.header_key in environ):
+            return self.wsgi_app(environ, start_response)
+        # Take the profiler before counting down, so that requests arriving
+        # while another one is profiled do not use up the armed count
+        if not self._active.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        route = self._claim(environ)
+        if route is None:
+            self._active.release()
+            return self.wsgi_app(environ, start_response)
+        
+        import cProfile
+        profile = cProfile.Profile()
+        status = []
+        
+        def capture_status(status_line, headers, exc_info=None):
+            status.append(int(status_line.split(' ', 1)[0]))
+            return start_response(status_line, headers, exc_info)
+        
+        def finish(seconds):
+            try:
+                self.save(profile, route, environ, status[0] if status else None, seconds)
+            finally:
+                self._active.release()
+        
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            try:
+                body = self.wsgi_app(environ, capture_status)
+            finally:
+                profile.disable()
+        except BaseException:
+            finish(time.perf_counter() - started)
+            raise
+        return ProfiledBody(body, profile, lambda: finish(time.perf_counter() - started))
+    
+    def save(self, profile, route, environ, status, seconds):
+        """Write the pstats file and a JSON summary of the capture"""
+        import pstats
+        directory = profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'
+        now = time.time()
+        name = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}-{slug}-{uuid.uuid4().hex[:6]}"
+        profile.dump_stats(os.path.join(directory, name + '.pstats'))
+        
+        stats = pstats.Stats(profile)
+        functions = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        summary = {
+            'name': name,
+            'file': name + '.pstats',
+            'at': now,
+            'route': route,
+            'method': environ.get('REQUEST_METHOD'),
+            'path': environ.get('PATH_INFO'),
+            'status': status,
+            'ms': round(seconds * 1000, 3),
+            'top': [{
+                'function': f'{function} ({os.path.basename(filename)}:{line})',
+                'calls': calls,
+                'cumulative_ms': round(cumulative * 1000, 3),
+                'own_ms': round(own * 1000, 3),
+            } for (filename, line, function), (_, calls, own, cumulative, _) in functions[:15]],
+        }
+        with open(os.path.join(directory, name + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f)
+        self.prune(directory)
+    
+    def prune(self, directory):
+        names = sorted(entry[:-len('.json')] for entry in os.listdir(directory) if entry.endswith('.json'))
+        for name in names[:-PROFILE_MAX_CAPTURES]:
+            for extension in ('.json', '.pstats'):
+                try:
+                    os.remove(os.path.join(directory, name + extension))
+                except OSError:
+                    pass
+    
+    def captures(self):
+        """Summaries of the stored captures, newest first"""
+        directory = profile_dir()
+        if not os.path.isdir(directory):
+            return []
+        captures = []
+        for entry in sorted(os.listdir(directory), reverse=True):
+            if entry.endswith('.json'):
+                try:
+                    with open(os.path.join(directory, entry), encoding='utf-8') as f:
+                        captures.append(json.load(f))
+                except (OSError, ValueError):
+                    pass
+        return captures
+
+class ProfiledBody:
+    """Response body iterator that keeps profiling while the body is produced"""
+    
+    def __init__(self, body, profile, on_close):
+        self.body = body
+        self.iterator = iter(body)
+        self.profile = profile
+        self.on_close = on_close
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        self.profile.enable()
+        try:
+            return next(self.iterator)
+        finally:
+            self.profile.disable()
+    
+    def close(self):
+        try:
+            if hasattr(self.body, 'close'):
+                self.profile.enable()
+                try:
+                    self.body.close()
+                finally:
+                    self.profile.disable()
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+                self.on_close = None
+
+PROFILER = RequestProfiler(app)
+app.wsgi_app = PROFILER
+
+HEALTH_STATUS = {'status': 'ok', 'message': 'Backend is running'}
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint for frontend connectivity monitoring"""
-    return jsonify({'status': 'ok', 'message': 'Backend is running'})
+    return jsonify(HEALTH_STATUS)
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Request metrics in the Prometheus text format"""
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/queries', methods=['GET'])
+def query_stats():
+    """Top statements by total (or max/calls) time and the slow-query log"""
+    sort = {'total': 'total_seconds', 'max': 'max_seconds', 'calls': 'calls'}.get(request.args.get('sort', 'total'))
+    if sort is None:
+        return jsonify({'error': 'Unbekannte Sortierung'}), 400
+    top = request.args.get('top', 20, type=int)
+    return jsonify(QUERY_TRACER.snapshot(top=max(top, 1), sort=sort))
+
+@app.route('/api/admin/queries', methods=['POST'])
+def configure_query_tracing():
+    """Switch statement tracing on or off and set the slow-query threshold"""
+    data = request.get_json(silent=True) or {}
+    enabled = data.get('enabled')
+    slow_ms = data.get('slow_ms')
+    if enabled is not None and not isinstance(enabled, bool):
+        return jsonify({'error': 'enabled muss true oder false sein'}), 400
+    if slow_ms is not None and (not isinstance(slow_ms, (int, float)) or slow_ms < 0):
+        return jsonify({'error': 'Ungültiger Schwellwert'}), 400
+    QUERY_TRACER.configure(enabled, slow_ms)
+    if data.get('reset'):
+        QUERY_TRACER.reset()
+    return jsonify(QUERY_TRACER.snapshot(top=0))
+
+@app.route('/api/admin/profiler', methods=['GET'])
+def profiler_status():
+    """Armed routes, header mode and the stored profiles, newest first"""
+    return jsonify({'armed': dict(PROFILER.armed), 'header': PROFILER.header_enabled,
+                    'directory': profile_dir(), 'captures': PROFILER.captures()})
+
+@app.route('/api/admin/profiler', methods=['POST'])
+def arm_profiler():
+    """Profile the next `count` requests to `route` (a route pattern such as /api/users).
+
+    {"header": true} lets requests with the X-Profile header be profiled
+    until it is switched off again or the profiler is disarmed.
+    """
+    data = request.get_json(silent=True) or {}
+    if 'header' in data:
+        if not isinstance(data['header'], bool):
+            return jsonify({'error': 'header muss true oder false sein'}), 400
+        PROFILER.header_enabled = data['header']
+        if 'route' not in data:
+            return jsonify({'armed': dict(PROFILER.armed), 'header': PROFILER.header_enabled})
+    route = data.get('route')
+    count = data.get('count', 1)
+    if route not in {rule.rule for rule in app.url_map.iter_rules()}:
+        return jsonify({'error': 'Unbekannte Route'}), 400
+    if not isinstance(count, int) or not 1 <= count <= PROFILE_MAX_REQUESTS:
+        return jsonify({'error': f'count muss zwischen 1 und {PROFILE_MAX_REQUESTS} liegen'}), 400
+    PROFILER.arm(route, count)
+    return jsonify({'armed': dict(PROFILER.armed), 'header': PROFILER.header_enabled})
+
+@app.route('/api/admin/profiler', methods=['DELETE'])
+def disarm_profiler():
+    PROFILER.disarm()
+    PROFILER.header_enabled = False
+    return jsonify({'armed': {}, 'header': False})
+
+@app.route('/api/admin/profiler/<name>', methods=['GET'])
+def download_profile(name):
+    """Download a stored capture as pstats file (snakeviz, flameprof, gprof2dot)"""
+    return send_from_directory(profile_dir(), name, as_attachment=True)
+
+@app.route('/api/admin/compression', methods=['GET'])
+def compression_stats():
+    """API compression statistics per route"""
+    return jsonify(COMPRESSION_STATS.snapshot())
+
+@app.route('/api/admin/admission', methods=['GET'])
+def admission_stats():
+    """Admission control statistics per route class"""
+    return jsonify({name: lane.stats() for name, lane in ADMISSION_LANES.items()})
+
+@app.route('/api/admin/events', methods=['GET'])
+def event_stats():
+    """Change feed statistics"""
+    return jsonify(EVENTS.stats())
+
+@app.route('/api/admin/cache', methods=['GET'])
+def cache_stats():
+    """Response cache statistics"""
+    return jsonify(RESPONSE_CACHE.stats())
+
+@app.route('/api/admin/pool', methods=['GET'])
+def pool_stats():
+    """Connection pool statistics"""
+    return jsonify(DB_POOL.stats())
+
+def tray_available():
+    """Import pystray and Pillow on first use; returns whether the tray can be shown"""
+    global TRAY_AVAILABLE
+    if TRAY_AVAILABLE is None:
+        try:
+            import pystray
+            from PIL import Image, ImageDraw
+            TRAY_AVAILABLE = True
+        except ImportError:
+            TRAY_AVAILABLE = False
+    return TRAY_AVAILABLE
 
 def create_tray_icon():
     """Load custom icon for the system tray"""
-    # Get the directory where the app is located
-    if hasattr(sys, '_MEIPASS'):
-        # Running as PyInstaller bundle
-        base_dir = sys._MEIPASS
-    else:
-        # Running as script
-        base_dir = os.path.dirname(os.path.abspath(__file__))
+    from PIL import Image, ImageDraw
+    base_dir = get_resource_dir()
     
     # Try to load custom icon files in order of preference
     icon_files = [
@@ -612,27 +3047,57 @@ def create_tray_icon():
     
     return image
 
-def open_browser():
-    """Open browser after a delay to ensure server is running"""
-    time.sleep(1.5)
-    webbrowser.open('http://127.0.0.1:5000')
-
-def show_startup_progress():
-    """Show startup progress with simple console output"""
-    steps = [
-        "🔧 Initialisiere Anwendung...",
-        "🗃️  Prüfe Datenbank...",
-        "🌐 Starte Web-Server...",
-        "🖥️  Bereite System Tray vor...",
-        "🚀 Öffne Browser...",
-        "✅ Bereit!"
-    ]
+class StartupTimer:
+    """Measures and prints the real duration of each startup phase"""
+    
+    def __init__(self, started=None, verbose=True):
+        self.started = started or time.perf_counter()
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self.phases = {}
+    
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            with self._lock:
+                self.phases[name] = duration
+            if self.verbose:
+                print(f"✅ {name} ({duration * 1000:.0f} ms)")
     
-    for i, step in enumerate(steps):
-        print(f"[{i+1}/{len(steps)}] {step}")
-        time.sleep(0.3)
+    def elapsed(self):
+        return time.perf_counter() - self.started
     
-    print("━" * 50)
+    def summary(self):
+        with self._lock:
+            phases = ', '.join(f'{name} {duration * 1000:.0f} ms' for name, duration in self.phases.items())
+        return f"⏱️  Start nach {self.elapsed() * 1000:.0f} ms ({phases})"
+
+def wait_until_accepting(port, timeout=10.0):
+    """Wait until the server accepts connections on port; returns success"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.01)
+    return False
+
+def open_browser(port, server_ready, timer=None, timeout=10.0):
+    """Open the browser as soon as the server is listening and the database is ready"""
+    server_ready.wait(timeout)
+    DATABASE_READY.wait(timeout)
+    if not wait_until_accepting(port, timeout):
+        print(f"❌ Server auf Port {port} nicht erreichbar")
+        return
+    import webbrowser
+    webbrowser.open(f'http://127.0.0.1:{port}')
+    if timer:
+        print(timer.summary())
 
 def quit_app(icon, item):
     """Quit the application"""
@@ -640,26 +3105,23 @@ def quit_app(icon, item):
     icon.stop()
     os._exit(0)
 
-def open_app(icon, item):
-    """Open the app in browser"""
-    # Try to find the port from the running app
-    for port in range(5000, 5010):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        try:
-            sock.connect(('127.0.0.1', port))
-            sock.close()
-            webbrowser.open(f'http://127.0.0.1:{port}')
-            return
-        except socket.error:
-            sock.close()
-            continue
-    # Fallback
-    webbrowser.open('http://127.0.0.1:5000')
+def open_app(icon=None, item=None):
+    """Open the app of this instance in the browser"""
+    import webbrowser
+    webbrowser.open(f'http://127.0.0.1:{SERVER_PORT}')
+
+def open_window():
+    """IPC handler: a second launch asks this instance to show itself"""
+    threading.Thread(target=lambda: wait_until_accepting(SERVER_PORT) and open_app(), daemon=True).start()
+    return {'ok': True, 'port': SERVER_PORT}
 
 def setup_tray():
     """Setup system tray icon"""
-    if not TRAY_AVAILABLE:
+    if not tray_available():
         return None
+    import pystray
+    import webbrowser
+    from pystray import MenuItem as item
     
     icon_image = create_tray_icon()
     
@@ -673,19 +3135,204 @@ def setup_tray():
     icon = pystray.Icon("benutzerverwaltung", icon_image, "Benutzerverwaltung", menu)
     return icon
 
-def run_flask(port=5000):
-    """Run Flask server"""
-    app.run(host='127.0.0.1', port=port, debug=False, use_reloader=False)
+def create_waitress_server(port, threads=None, streams=None, connection_limit=None, channel_timeout=None):
+    """Bind a Waitress server for the app; raises ImportError without Waitress"""
+    from waitress import create_server
+    threads = threads or SERVER_THREADS
+    streams = streams or SERVER_STREAMS
+    # Every open event stream occupies a worker thread for as long as the
+    # tab is open, so streams get threads on top of those for normal requests
+    ADMISSION_LANES['stream'].concurrency = streams
+    return create_server(app, host='127.0.0.1', port=port,
+                         threads=threads + streams,
+                         connection_limit=connection_limit or SERVER_CONNECTION_LIMIT,
+                         channel_timeout=channel_timeout or SERVER_CHANNEL_TIMEOUT,
+                         max_request_body_size=SERVER_MAX_REQUEST_BODY,
+                         ident='Benutzerverwaltung')
+
+def run_flask(port=5000, server=None, threads=None, ready=None, servers=None, options=None):
+    """Run Flask server on Waitress, or on the Werkzeug development server.
+
+    `ready` is set as soon as the socket is listening, or when binding failed.
+    The bound server is appended to `servers`, so the caller can stop it.
+    `options` holds further keyword arguments of create_waitress_server().
+    """
+    server = server or SERVER_MODE
+    threads = threads or SERVER_THREADS
+    ready = ready or threading.Event()
+    
+    try:
+        if server == 'waitress':
+            try:
+                http_server = create_waitress_server(port, threads, **(options or {}))
+            except ImportError:
+                print("⚠️  Waitress nicht verfügbar, verwende Werkzeug. Installieren Sie: pip install waitress")
+            else:
+                print(f"🏭 Waitress mit {threads} Threads und {ADMISSION_LANES['stream'].concurrency} für Event-Streams")
+                if servers is not None:
+                    servers.append(http_server)
+                ready.set()
+                http_server.run()
+                return
+        
+        from werkzeug.serving import make_server
+        http_server = make_server('127.0.0.1', port, app, threaded=True)
+        if servers is not None:
+            servers.append(http_server)
+        ready.set()
+        http_server.serve_forever()
+    finally:
+        ready.set()
+
+def start_services(port, args, timer):
+    """Start the server and initialize the database concurrently.
+
+    Returns the event that is set once the server is listening; requests
+    arriving before init_db() has finished wait for DATABASE_READY.
+    """
+    DATABASE_READY.clear()
+    server_ready = threading.Event()
+    options = {'streams': args.streams, 'connection_limit': args.connection_limit,
+               'channel_timeout': args.channel_timeout}
+    
+    def start_server():
+        with timer.phase("Web-Server lauscht"):
+            flask_thread = threading.Thread(target=lambda: run_flask(port, args.server, args.threads, server_ready,
+                                                                     options=options),
+                                            daemon=True)
+            flask_thread.start()
+            server_ready.wait()
+    
+    threading.Thread(target=start_server, daemon=True).start()
+    threading.Thread(target=prepare_database, args=(timer,), daemon=True).start()
+    return server_ready
+
+def prepare_database(timer):
+    """Run init_db() and release the held requests; a failure makes them answer 503"""
+    global DATABASE_ERROR
+    DATABASE_ERROR = None
+    try:
+        with timer.phase("Datenbank bereit"):
+            init_db()
+    except Exception as e:
+        DATABASE_ERROR = str(e)
+        print(f"❌ Datenbank konnte nicht geöffnet werden: {e}")
+        return
+    finally:
+        DATABASE_READY.set()
+    if timer.verbose:
+        print(f"📁 Datenbank: {DATABASE}")
+
+def slowest_imports(count=15):
+    """Cumulative import times of app.py measured in a fresh interpreter"""
+    import subprocess
+    script = os.path.abspath(__file__)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         f'import sys; sys.path.insert(0, {os.path.dirname(script)!r}); import app'],
+        capture_output=True, text=True, timeout=60,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            imports.append((parts[2].rstrip(), int(parts[1]) / 1000))
+    imports.sort(key=lambda entry: entry[1], reverse=True)
+    return [{'module': name.strip(), 'depth': (len(name) - len(name.lstrip())) // 2, 'cumulative_ms': round(ms, 1)}
+            for name, ms in imports[:count]]
+
+def profile_startup(args):
+    """Start headless, time every phase up to the first HTTP response and print a report"""
+    import http.client
+    imported = time.perf_counter()
+    timer = StartupTimer(started=STARTUP_STARTED, verbose=False)
+    timer.phases['Import'] = imported - STARTUP_STARTED
+    
+    port = find_available_port(5000)
+    if port is None:
+        print("❌ Kein verfügbarer Port gefunden (5000-5009)!")
+        sys.exit(1)
+    server_ready = start_services(port, args, timer)
+    with timer.phase("Erste Antwort"):
+        server_ready.wait(10)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        conn.request('GET', '/api/health')
+        status = conn.getresponse().status
+        conn.close()
+    first_response_ms = timer.elapsed() * 1000
+    
+    report = {
+        'first_response_ms': round(first_response_ms, 1),
+        'budget_ms': STARTUP_BUDGET_MS,
+        'within_budget': status == 200 and first_response_ms <= STARTUP_BUDGET_MS,
+        'status': status,
+        'server': args.server,
+        'phases_ms': {name: round(duration * 1000, 1) for name, duration in timer.phases.items()},
+        'deferred_modules_loaded': {name: name in sys.modules for name in DEFERRED_MODULES},
+    }
+    if not getattr(sys, 'frozen', False):
+        report['slowest_imports'] = slowest_imports()
+    
+    print(f"⏱️  Erste Antwort nach {first_response_ms:.0f} ms (Budget {STARTUP_BUDGET_MS:.0f} ms)")
+    for name, duration in report['phases_ms'].items():
+        print(f"   {name}: {duration} ms")
+    print(json.dumps(report))
+    return report
+
+def env_threads():
+    """Worker threads from BENUTZERVERWALTUNG_THREADS, SERVER_THREADS if unset or invalid"""
+    value = os.environ.get('BENUTZERVERWALTUNG_THREADS', '')
+    if not value:
+        return SERVER_THREADS
+    try:
+        threads = int(value)
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        print(f"⚠️  Ungültiger Wert BENUTZERVERWALTUNG_THREADS={value!r}, verwende {SERVER_THREADS} Threads")
+        return SERVER_THREADS
+    return threads
+
+def parse_args():
+    """Command line options of the application"""
+    parser = argparse.ArgumentParser(description='Benutzerverwaltung')
+    parser.add_argument('--server', choices=['waitress', 'werkzeug'], default=SERVER_MODE,
+                        help='Web-Server (Standard: %(default)s, Umgebungsvariable BENUTZERVERWALTUNG_SERVER)')
+    parser.add_argument('--threads', type=int, default=env_threads(),
+                        help='Worker-Threads für Waitress (Standard: %(default)s)')
+    parser.add_argument('--streams', type=int,
+                        default=env_number('BENUTZERVERWALTUNG_STREAMS', SERVER_STREAMS, int, minimum=1),
+                        help='Gleichzeitige Event-Streams (offene Tabs) mit eigenen Threads (Standard: %(default)s)')
+    parser.add_argument('--connection-limit', type=int,
+                        default=env_number('BENUTZERVERWALTUNG_CONNECTION_LIMIT', SERVER_CONNECTION_LIMIT, int, minimum=1),
+                        help='Maximal offene Verbindungen bei Waitress (Standard: %(default)s)')
+    parser.add_argument('--channel-timeout', type=int,
+                        default=env_number('BENUTZERVERWALTUNG_CHANNEL_TIMEOUT', SERVER_CHANNEL_TIMEOUT, int, minimum=1),
+                        help='Sekunden, die eine untätige Verbindung offen bleibt (Standard: %(default)s)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Start ohne Browser und Tray, Startzeiten messen und beenden')
+    # PyInstaller/macOS may pass extra arguments such as -psn_0_12345
+    args, _ = parser.parse_known_args()
+    return args
 
 if __name__ == '__main__':
+    args = parse_args()
+    if args.profile_startup:
+        report = profile_startup(args)
+        os._exit(0 if report['within_budget'] else 1)
+    
     print("🚀 Benutzerverwaltung mit System Tray")
     print("=" * 50)
     
     # Check for multiple instances
     if not create_lock_file():
+        # The running instance holds the lock but has not published its state yet
+        reply = wait_for_running_instance()
+        if reply:
+            print(f"✅ Benutzerverwaltung läuft bereits, Browser geöffnet: http://127.0.0.1:{reply['port']}")
+            sys.exit(0)
         print("❌ Eine Instanz der Anwendung läuft bereits!")
         print("   Prüfen Sie das System Tray für das laufende Programm.")
-        input("Drücken Sie Enter zum Beenden...")
         sys.exit(1)
     
     # Find available port
@@ -693,32 +3340,29 @@ if __name__ == '__main__':
     if port is None:
         print("❌ Kein verfügbarer Port gefunden (5000-5009)!")
         cleanup_lock_file()
-        input("Drücken Sie Enter zum Beenden...")
         sys.exit(1)
+    SERVER_PORT = port
     
-    # Show startup progress
-    show_startup_progress()
+    # Let later launches find this instance and ask it to open the browser
+    instance_server = instance.InstanceServer({'open': open_window}).start()
+    instance.write_state(port, instance_server)
     
-    # Initialize database
-    init_db()
-    print(f"📁 Datenbank: {DATABASE}")
+    timer = StartupTimer()
+    server_ready = start_services(port, args, timer)
     
-    if not TRAY_AVAILABLE:
+    # Render and compress the page before the first request needs it
+    with timer.phase("Seite komprimiert"):
+        get_static_assets()
+    
+    if not tray_available():
         print("⚠️  System Tray nicht verfügbar. Installieren Sie: pip install pystray Pillow")
         print("   Die Anwendung läuft im Konsolenmodus.")
     
-    # Start Flask in a separate thread
-    flask_thread = threading.Thread(target=lambda: run_flask(port), daemon=True)
-    flask_thread.start()
-    
-    # Wait a moment for server to start
-    time.sleep(0.5)
-    
-    # Start browser
-    threading.Thread(target=lambda: (time.sleep(1.5), webbrowser.open(f'http://127.0.0.1:{port}')), daemon=True).start()
+    # Open the browser the moment the port accepts connections
+    threading.Thread(target=open_browser, args=(port, server_ready, timer), daemon=True).start()
     
     # Setup and run system tray (this blocks until quit)
-    if TRAY_AVAILABLE:
+    if tray_available():
         try:
             print("📱 System Tray aktiv - Rechtsklick für Optionen")
             print(f"🌐 Browser: http://127.0.0.1:{port}")
@@ -0,0 +1,231 @@
+"""
+ASGI entry point serving the same API as app.py on asyncio.
+
+Connections are handled on the event loop, so idle keep-alive and event
+stream clients cost no thread. /api/events and /api/health are answered
+directly on the loop; every other request runs the Flask app on a bounded
+thread pool, which also does all the SQLite work and keeps the API
+contract identical to the WSGI server.
+
+    pip install uvicorn
+    python asgi.py --port 5000
+"""
+import argparse
+import asyncio
+import io
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from app import (app as flask_app, init_db, EVENTS, EVENT_HEARTBEAT_SECONDS,
+                 HEALTH_STATUS, SERVER_CHANNEL_TIMEOUT, SERVER_MAX_REQUEST_BODY)
+
+# Threads running Flask handlers and their SQLite queries
+ASGI_WORKER_THREADS = 8
+# Open connections accepted by uvicorn, mostly idle event streams
+ASGI_CONNECTION_LIMIT = 10000
+
+executor = ThreadPoolExecutor(max_workers=ASGI_WORKER_THREADS, thread_name_prefix='asgi-worker')
+
+# Marks the end of a WSGI body iterator
+END = object()
+
+def build_environ(scope, body):
+    """WSGI environ for an ASGI HTTP request with an already read body"""
+    server = scope.get('server') or ('127.0.0.1', 80)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+def start_flask(environ):
+    """Run the Flask app up to its first body chunk (in a worker thread)"""
+    started = {}
+    written = []
+    
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                              for name, value in headers]
+        return written.append
+    
+    result = flask_app(environ, start_response)
+    iterator = iter(result)
+    first = next(iterator, END)
+    if written:
+        first = b''.join(written) + (b'' if first is END else first)
+    return started, result, iterator, first
+
+async def read_body(receive):
+    """Read the complete request body; None if it exceeds the size limit"""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > SERVER_MAX_REQUEST_BODY:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def send_json(send, status, data):
+    body = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            (b'access-control-allow-origin', b'*'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def run_flask_request(scope, receive, send):
+    """Serve a request with the Flask app, streaming its body chunk by chunk"""
+    body = await read_body(receive)
+    if body is None:
+        await send_json(send, 413, {'error': 'Anfrage zu groß'})
+        return
+    
+    loop = asyncio.get_running_loop()
+    started, result, iterator, chunk = await loop.run_in_executor(
+        executor, start_flask, build_environ(scope, body))
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': started['status'],
+            'headers': started['headers'],
+        })
+        while chunk is not END and not disconnected.done():
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            chunk = await loop.run_in_executor(executor, next, iterator, END)
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        disconnected.cancel()
+        if hasattr(result, 'close'):
+            await loop.run_in_executor(executor, result.close)
+
+async def event_stream(scope, receive, send):
+    """The /api/events feed served on the event loop without a thread"""
+    headers = dict(scope.get('headers', []))
+    last_event_id = headers.get(b'last-event-id', b'').decode('latin-1')
+    if not last_event_id:
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        last_event_id = query.get('lastEventId', [''])[0]
+    
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+    
+    def notify():
+        loop.call_soon_threadsafe(wake.set)
+    
+    EVENTS.add_listener(notify)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                (b'access-control-allow-origin', b'*'),
+            ],
+        })
+        after, chunk = EVENTS.open_stream(last_event_id)
+        while not disconnected.done():
+            await send({'type': 'http.response.body', 'body': chunk.encode('utf-8'), 'more_body': True})
+            wake.clear()
+            events = EVENTS.events_after(after)
+            if events == []:
+                waiter = asyncio.ensure_future(wake.wait())
+                done, _ = await asyncio.wait({waiter, disconnected}, timeout=EVENT_HEARTBEAT_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+                if disconnected in done:
+                    break
+                if waiter in done:
+                    events = EVENTS.events_after(after)
+            after, chunk = EVENTS.render(after, events)
+    finally:
+        EVENTS.remove_listener(notify)
+        disconnected.cancel()
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            init_db()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def application(scope, receive, send):
+    """ASGI application"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] != 'http':
+        return
+    elif scope['path'] == '/api/events' and scope['method'] == 'GET':
+        await event_stream(scope, receive, send)
+    elif scope['path'] == '/api/health' and scope['method'] == 'GET':
+        await send_json(send, 200, HEALTH_STATUS)
+    else:
+        await run_flask_request(scope, receive, send)
+
+def run_asgi(port=5000):
+    """Run the ASGI application on uvicorn"""
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn nicht verfügbar. Installieren Sie: pip install uvicorn")
+        sys.exit(1)
+    uvicorn.run(application, host='127.0.0.1', port=port, log_level='warning',
+                timeout_keep_alive=SERVER_CHANNEL_TIMEOUT,
+                limit_concurrency=ASGI_CONNECTION_LIMIT)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benutzerverwaltung (ASGI)')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+    print(f"🌐 ASGI-Server: http://127.0.0.1:{args.port}")
+    run_asgi(args.port)
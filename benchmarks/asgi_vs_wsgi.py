@@ -0,0 +1,95 @@
+"""
+Compare the WSGI (Waitress) and ASGI (uvicorn) serving paths.
+
+For each server the same read mix is driven twice: once on its own and
+once while a number of idle /api/events streams are held open. The result
+shows how many streams each path accepts and what they cost in threads
+and latency.
+
+    pip install uvicorn
+    python benchmarks/asgi_vs_wsgi.py --users 10000 --streams 200
+"""
+import argparse
+import json
+import socket
+import threading
+
+from common import (free_port, run_load, seed_users, start_asgi_server,
+                    start_wsgi_server, temp_database)
+
+def open_idle_streams(port, count):
+    """Open `count` event streams; returns (open sockets, rejected count)"""
+    streams = []
+    rejected = 0
+    for _ in range(count):
+        sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+        sock.sendall(b'GET /api/events HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n')
+        status_line = sock.recv(4096).split(b'\r\n', 1)[0]
+        if b' 200 ' in status_line:
+            streams.append(sock)
+        else:
+            rejected += 1
+            sock.close()
+    return streams, rejected
+
+def read_mix(ids):
+    def next_request(rng):
+        roll = rng.random()
+        if roll < 0.6:
+            return 'GET', '/api/users?limit=50', None
+        if roll < 0.9:
+            return 'GET', f'/api/users/{rng.choice(ids)}', None
+        return 'GET', '/api/health', None
+    return next_request
+
+def benchmark_server(name, start_server, ids, args):
+    port = free_port()
+    stop = start_server(port)
+    try:
+        result = {'load': run_load(port, read_mix(ids), args.concurrency, args.duration)}
+        streams, rejected = open_idle_streams(port, args.streams)
+        try:
+            result['idle_streams'] = {
+                'requested': args.streams,
+                'accepted': len(streams),
+                'rejected': rejected,
+                'process_threads': threading.active_count(),
+            }
+            result['load_with_streams'] = run_load(port, read_mix(ids), args.concurrency, args.duration)
+        finally:
+            for sock in streams:
+                sock.close()
+    finally:
+        stop()
+    print(f"{name}: {result['load']['throughput_rps']} req/s, "
+          f"p99 {result['load']['p99_ms']} ms, "
+          f"{result['idle_streams']['accepted']}/{args.streams} Streams")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--streams', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8, help='Waitress worker threads')
+    parser.add_argument('--output', help='write the JSON result to this file')
+    args = parser.parse_args()
+
+    with temp_database():
+        ids = seed_users(args.users)
+        results = {
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'wsgi': benchmark_server('WSGI (Waitress)', lambda port: start_wsgi_server(port, args.threads), ids, args),
+            'asgi': benchmark_server('ASGI (uvicorn)', start_asgi_server, ids, args),
+        }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Shared helpers for the benchmark scripts: temporary databases, in-process
+servers and a small keep-alive HTTP load generator. Everything runs
+offline against 127.0.0.1.
+"""
+import http.client
+import logging
+import os
+import random
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import app as backend
+
+VORNAMEN = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hans',
+            'Ida', 'Jürgen', 'Karl', 'Lena', 'Max', 'Nora', 'Otto', 'Paula']
+NACHNAMEN = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer',
+             'Wagner', 'Becker', 'Schulz', 'Hoffmann', 'Koch', 'Strauß']
+
+@contextmanager
+def temp_database():
+    """Point the app at a fresh database in a temporary directory, removed afterwards"""
+    with tempfile.TemporaryDirectory(prefix='benutzerverwaltung-bench-') as directory:
+        backend.DATABASE = os.path.join(directory, 'users.db')
+        backend.init_db()
+        try:
+            yield backend.DATABASE
+        finally:
+            # Pooled connections keep the files open (and locked on Windows)
+            backend.DB_POOL.close_all()
+
+def seed_users(count, batch_size=50000, seed=42):
+    """Insert `count` users with random names; returns their ids"""
+    rng = random.Random(seed)
+    ids = []
+    with sqlite3.connect(backend.DATABASE) as conn:
+        for start in range(0, count, batch_size):
+            rows = []
+            for _ in range(min(batch_size, count - start)):
+                user_id = backend.new_user_id()
+                ids.append(user_id)
+                rows.append((backend.user_id_to_db(user_id), rng.choice(VORNAMEN), f'{rng.choice(NACHNAMEN)}{rng.randrange(1000)}'))
+            conn.executemany(backend.INSERT_USER_SQL, rows)
+            conn.commit()
+    return ids
+
+def free_port():
+    """A currently unused TCP port on 127.0.0.1"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.01)
+    raise RuntimeError(f'Server auf Port {port} nicht erreichbar')
+
+def start_wsgi_server(port, threads=8):
+    """Run the Flask app on Waitress in a background thread"""
+    # Waitress warns about every queued task, which floods the output under load
+    logging.getLogger('waitress.queue').setLevel(logging.ERROR)
+    server = backend.create_waitress_server(port, threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    wait_for_port(port)
+
+    def stop():
+        # Waitress cannot be shut down cleanly from another thread; stop
+        # accepting connections and let the daemon thread end with the process
+        server.accepting = False
+    return stop
+
+def start_asgi_server(port):
+    """Run the ASGI application on uvicorn in a background thread"""
+    import uvicorn
+    import asgi
+    config = uvicorn.Config(asgi.application, host='127.0.0.1', port=port, log_level='warning',
+                            limit_concurrency=asgi.ASGI_CONNECTION_LIMIT)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    wait_for_port(port)
+
+    def stop():
+        server.should_exit = True
+    return stop
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def run_load(port, next_request, concurrency, duration, seed=1):
+    """Drive requests from `concurrency` keep-alive clients for `duration` seconds.
+
+    `next_request(rng)` returns (method, path, body) for every request.
+    Returns throughput, latency percentiles in milliseconds and the count
+    of responses per status code.
+    """
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    latencies = []
+    statuses = {}
+
+    def client(index):
+        rng = random.Random(seed + index)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local_latencies = []
+        local_statuses = {}
+        while time.perf_counter() < deadline:
+            method, path, body = next_request(rng)
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                status = 'error'
+            local_latencies.append(time.perf_counter() - started)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+    }
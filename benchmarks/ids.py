@@ -0,0 +1,98 @@
+"""
+Compare insert throughput and database size of UUIDv4 and UUIDv7 user ids.
+
+For each id version a fresh database is filled with N users the way bulk
+onboarding writes them: batches of rows, one transaction per batch, through
+a pooled connection with the app's PRAGMAs. Random v4 ids hit a random page
+of the primary key B-tree on every insert, time-ordered v7 ids append at
+its right edge. After a WAL checkpoint the file size and, where SQLite has
+the dbstat table, the size and fill ratio of the primary key B-tree are
+reported.
+
+    python benchmarks/ids.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import time
+
+from common import NACHNAMEN, VORNAMEN, backend, temp_database
+
+def insert_users(rows, batch_size, seed=42):
+    """Insert `rows` users with new ids; returns the rows/s per batch"""
+    rng = random.Random(seed)
+    rates = []
+    conn = backend.get_db_connection()
+    try:
+        for start in range(0, rows, batch_size):
+            count = min(batch_size, rows - start)
+            started = time.perf_counter()
+            batch = [(backend.user_id_to_db(backend.new_user_id()), rng.choice(VORNAMEN),
+                      f'{rng.choice(NACHNAMEN)}{rng.randrange(1000)}') for _ in range(count)]
+            with conn:
+                conn.executemany(backend.INSERT_USER_SQL, batch)
+            rates.append(count / (time.perf_counter() - started))
+    finally:
+        conn.close()
+    return rates
+
+def table_stats(conn):
+    """Size and fill ratio of the users table and its indexes, or None without dbstat"""
+    try:
+        rows = conn.execute('''
+            SELECT name, count(*), sum(payload), sum(pgsize) FROM dbstat
+            WHERE name IN ('users', 'idx_users_name_order', 'idx_users_search_rowid')
+            GROUP BY name
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        return None
+    return {name: {'pages': pages, 'mb': round(size / 1024 / 1024, 1), 'fill': round(payload / size, 3)}
+            for name, pages, payload, size in rows}
+
+def measure(version, rows, batch_size):
+    backend.USER_ID_VERSION = version
+    with temp_database() as database:
+        started = time.perf_counter()
+        rates = insert_users(rows, batch_size)
+        elapsed = time.perf_counter() - started
+
+        conn = backend.get_db_connection()
+        try:
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            tables = table_stats(conn)
+        finally:
+            conn.close()
+        file_size = os.path.getsize(database)
+    # The last tenth shows how inserts slow down once the table outgrows the page cache
+    tail = rates[-max(1, len(rates) // 10):]
+    return {
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round(rows / elapsed),
+        'last_tenth_rows_per_second': round(sum(tail) / len(tail)),
+        'file_mb': round(file_size / 1024 / 1024, 1),
+        'tables': tables,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=10000, help='rows per transaction')
+    parser.add_argument('--output', help='write the JSON result to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for version in (4, 7):
+        results[f'v{version}'] = stats = measure(version, args.rows, args.batch_size)
+        print(f"UUIDv{version}: {stats['rows_per_second']} Zeilen/s "
+              f"(letztes Zehntel {stats['last_tenth_rows_per_second']}), {stats['file_mb']} MB")
+
+    output = json.dumps({'rows': args.rows, 'batch_size': args.batch_size, 'results': results}, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
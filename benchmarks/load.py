@@ -0,0 +1,150 @@
+"""
+HTTP load benchmark for the user API.
+
+Seeds a temporary database with N users, runs the app on Waitress in this
+process and drives a read, mixed or write workload against /api/users,
+/api/users/<id> and /api/health at a fixed concurrency. Results are
+printed as JSON and can be stored as a baseline and compared later.
+Everything runs offline against 127.0.0.1.
+
+    python benchmarks/load.py --users 10000 100000 --mix read mixed write
+    python benchmarks/load.py --save-baseline benchmarks/load_baseline.json
+    python benchmarks/load.py --baseline benchmarks/load_baseline.json
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import threading
+
+from common import backend, free_port, run_load, seed_users, start_wsgi_server, temp_database
+
+# Share of each request kind per workload; the weights of a mix add up to 1
+MIXES = {
+    'read': {'list': 0.5, 'list_deep': 0.1, 'get': 0.3, 'health': 0.1},
+    'mixed': {'list': 0.4, 'list_deep': 0.1, 'get': 0.25, 'health': 0.05,
+              'create': 0.1, 'update': 0.08, 'delete': 0.02},
+    'write': {'create': 0.45, 'update': 0.45, 'delete': 0.1},
+}
+
+PAGE_SIZE = 50
+
+def sample_cursors(count=1000):
+    """Pagination cursors pointing at random positions of the listing"""
+    with sqlite3.connect(backend.DATABASE) as conn:
+        rows = conn.execute(
+            'SELECT nachname, vorname, id FROM users ORDER BY random() LIMIT ?', (count,)
+        ).fetchall()
+    return [backend.encode_cursor({'nachname': n, 'vorname': v, 'id': backend.user_id_from_db(i)})
+            for n, v, i in rows]
+
+class Workload:
+    """Picks the next request of a mix by weight"""
+
+    def __init__(self, mix, ids, cursors):
+        self.kinds = list(MIXES[mix])
+        self.weights = [MIXES[mix][kind] for kind in self.kinds]
+        self.ids = ids
+        self.cursors = cursors
+        self.counter = 0
+        self.lock = threading.Lock()
+
+    def next_name(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    def __call__(self, rng):
+        kind = rng.choices(self.kinds, self.weights)[0]
+        if kind == 'list':
+            return 'GET', f'/api/users?limit={PAGE_SIZE}', None
+        if kind == 'list_deep':
+            return 'GET', f'/api/users?limit={PAGE_SIZE}&cursor={rng.choice(self.cursors)}', None
+        if kind == 'get':
+            return 'GET', f'/api/users/{rng.choice(self.ids)}', None
+        if kind == 'health':
+            return 'GET', '/api/health', None
+        if kind == 'update':
+            body = json.dumps({'vorname': 'Last', 'nachname': f'Test{self.next_name()}'})
+            return 'PUT', f'/api/users/{rng.choice(self.ids)}', body
+        if kind == 'delete':
+            # Deleting a random id also exercises the 404 path once it is gone
+            return 'DELETE', f'/api/users/{rng.choice(self.ids)}', None
+        body = json.dumps({'vorname': 'Last', 'nachname': f'Test{self.next_name()}'})
+        return 'POST', '/api/users', body
+
+def compare(results, baseline, tolerance):
+    """Scenarios whose throughput dropped or p99 latency rose by more than tolerance"""
+    regressions = []
+    for scenario, result in results.items():
+        previous = baseline.get('results', {}).get(scenario)
+        if not previous:
+            continue
+        throughput = result['throughput_rps'] / previous['throughput_rps'] - 1 if previous['throughput_rps'] else 0
+        p99 = result['p99_ms'] / previous['p99_ms'] - 1 if previous['p99_ms'] else 0
+        result['vs_baseline'] = {'throughput': round(throughput, 3), 'p99': round(p99, 3)}
+        if throughput < -tolerance or p99 > tolerance:
+            regressions.append(scenario)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[10000])
+    parser.add_argument('--mix', choices=list(MIXES), nargs='+', default=['read', 'mixed', 'write'])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--threads', type=int, default=8, help='Waitress worker threads')
+    parser.add_argument('--baseline', help='compare against this stored result')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='allowed throughput drop / p99 rise against the baseline (default 10%%)')
+    parser.add_argument('--save-baseline', help='store the result as baseline in this file')
+    parser.add_argument('--output', help='write the JSON result to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for users in sorted(args.users):
+        with temp_database():
+            ids = seed_users(users)
+            cursors = sample_cursors()
+            port = free_port()
+            stop = start_wsgi_server(port, args.threads)
+            try:
+                for mix in args.mix:
+                    result = run_load(port, Workload(mix, ids, cursors), args.concurrency, args.duration)
+                    results[f'{users}/{mix}'] = result
+                    print(f"{users} Benutzer, {mix}: {result['throughput_rps']} req/s, "
+                          f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms",
+                          file=sys.stderr)
+            finally:
+                stop()
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+        },
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'threads': args.threads,
+        'results': results,
+    }
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+
+    output = json.dumps(report, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                f.write(output)
+    print(output)
+    if regressions:
+        print(f"❌ Langsamer als die Baseline: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Compare the Python and the SQL-side JSON encoding of user listings.
+
+For each table size the whole table is encoded once per path, the way
+GET /api/users encodes a page: the Python path turns every row into a dict
+and runs it through Flask's JSON encoder, the SQL paths let SQLite build
+the JSON with json_object() (joined in Python) or json_group_array()
+(one string for the whole result). Time and peak Python memory are
+measured per path.
+
+    python benchmarks/serialization.py --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from common import backend, seed_users, temp_database
+
+def encode_python(conn):
+    rows = conn.execute(
+        'SELECT id, vorname, nachname FROM users ORDER BY nachname, vorname, id'
+    ).fetchall()
+    users = [backend.user_from_row(row) for row in rows]
+    return backend.app.json.dumps(users).encode('utf-8')
+
+def encode_sql_fragments(conn):
+    rows = conn.execute(
+        f'SELECT {backend.USER_JSON_SQL} FROM users ORDER BY nachname, vorname, id'
+    ).fetchall()
+    return ('[' + ','.join([row[0] for row in rows]) + ']').encode('utf-8')
+
+def encode_sql_array(conn):
+    row = conn.execute(f'''
+        SELECT json_group_array(json(user)) FROM (
+            SELECT {backend.USER_JSON_SQL} AS user FROM users ORDER BY nachname, vorname, id
+        )
+    ''').fetchone()
+    return row[0].encode('utf-8')
+
+PATHS = {
+    'python': encode_python,
+    'sql_fragments': encode_sql_fragments,
+    'sql_group_array': encode_sql_array,
+}
+
+def measure(encode, size, repeat):
+    """Best wall time over `repeat` runs, then one run under tracemalloc"""
+    timings = []
+    for _ in range(repeat):
+        conn = backend.get_db_connection(readonly=True)
+        try:
+            started = time.perf_counter()
+            body = encode(conn)
+            timings.append(time.perf_counter() - started)
+        finally:
+            conn.close()
+
+    conn = backend.get_db_connection(readonly=True)
+    try:
+        tracemalloc.start()
+        encode(conn)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        conn.close()
+    return body, {
+        'seconds': round(min(timings), 4),
+        'rows_per_second': round(size / min(timings)),
+        'peak_memory_mb': round(peak / 1024 / 1024, 1),
+        'bytes': len(body),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the JSON result to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for size in sorted(args.sizes):
+        with temp_database():
+            seed_users(size)
+            results[size] = {}
+            reference = None
+            for name, encode in PATHS.items():
+                body, stats = measure(encode, size, args.repeat)
+                decoded = json.loads(body)
+                if reference is None:
+                    reference = decoded
+                elif decoded != reference:
+                    raise RuntimeError(f'{name} liefert andere Daten als python')
+                results[size][name] = stats
+            baseline = results[size]['python']['seconds']
+            for stats in results[size].values():
+                stats['speedup'] = round(baseline / stats['seconds'], 2)
+            print(f"{size} Benutzer: " + ', '.join(
+                f"{name} {stats['seconds']} s" for name, stats in results[size].items()))
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
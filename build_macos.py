@@ -1,16 +1,33 @@
 import PyInstaller.__main__
+import argparse
+import json
 import os
+import queue
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 
-def build_macos_app_with_tray():
-    """Build the macOS application with system tray using PyInstaller"""
-    
-    # PyInstaller arguments for macOS
+APP_NAME = 'Benutzerverwaltung-Tray'
+
+# Seconds a --profile-startup run may take before it is killed
+STARTUP_MEASURE_TIMEOUT = 60
+
+# Modules PyInstaller picks up through optional imports but the app never uses
+FAST_LAUNCH_EXCLUDES = [
+    'tkinter', 'unittest', 'doctest', 'pydoc', 'pydoc_data', 'lib2to3', 'idlelib',
+    'curses', 'xmlrpc', 'test', 'setuptools', 'pip', 'pytest', 'requests',
+    'uvicorn', 'asgi', 'PIL.ImageTk', 'PIL.ImageQt',
+]
+
+def build_args(fast_launch=False):
+    """PyInstaller arguments of the default (onefile) or the fast-launch profile"""
     args = [
         'app.py',
-        '--onefile',
+        '--onedir' if fast_launch else '--onefile',
         '--windowed',  # No terminal window
-        '--name=Benutzerverwaltung-Tray',
+        f'--name={APP_NAME}',
         '--hidden-import=sqlite3',
         '--hidden-import=uuid',
         '--hidden-import=threading',
@@ -21,28 +38,143 @@ def build_macos_app_with_tray():
         '--hidden-import=PIL',
         '--hidden-import=PIL.Image',
         '--hidden-import=PIL.ImageDraw',
+        '--hidden-import=waitress',
         '--add-data=icons:icons',  # Include icon files
         '--osx-bundle-identifier=com.benutzerverwaltung.tray.app',
         # '--target-arch=universal2',  # Skip universal binary due to conda limitations
     ]
-    
-    print("Building macOS application with System Tray using PyInstaller...")
+
+    if fast_launch:
+        # onedir starts without unpacking the bundle into a temp dir first
+        args += ['--strip', '--noupx', '--noconfirm']
+        args += [f'--exclude-module={module}' for module in FAST_LAUNCH_EXCLUDES]
+
+    # Bundle the Vite frontend build when it exists (python build_frontend.py)
+    if os.path.exists(os.path.join('dist', 'index.html')):
+        args += [
+            '--add-data=dist/index.html:dist',
+            '--add-data=dist/assets:dist/assets',
+        ]
+    return args
+
+def built_bundle():
+    """Path of the built app bundle (or executable) and of the executable inside it"""
+    app_bundle = os.path.join('dist', f'{APP_NAME}.app')
+    if os.path.isdir(app_bundle):
+        return app_bundle, os.path.join(app_bundle, 'Contents', 'MacOS', APP_NAME)
+    onedir = os.path.join('dist', APP_NAME)
+    if os.path.isdir(onedir):
+        return onedir, os.path.join(onedir, APP_NAME)
+    return onedir, onedir
+
+def bundle_size(path):
+    """Size of a file or directory tree in bytes"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                total += os.path.getsize(file_path)
+    return total
+
+def first_report(process, timeout):
+    """(time of the JSON report line, report) of a --profile-startup run; None on exit or timeout"""
+    lines = queue.Queue()
+
+    def read():
+        for line in process.stdout:
+            lines.put((time.perf_counter(), line))
+        lines.put(None)
+
+    threading.Thread(target=read, daemon=True).start()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            item = lines.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            return None
+        if item is None:
+            return None
+        received, line = item
+        if line.startswith('{'):
+            return received, json.loads(line)
+
+def measure_startup(executable, runs=3):
+    """Launch the built app with --profile-startup and time it until the first HTTP response.
+
+    The time is taken from process launch, so it includes unpacking the
+    onefile bundle, which the app itself cannot see. The app runs against
+    a temporary database, never the user's own.
+    """
+    launches = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        env = dict(os.environ, BENUTZERVERWALTUNG_DATABASE=os.path.join(temp_dir, 'users.db'))
+        for _ in range(runs):
+            started = time.perf_counter()
+            process = subprocess.Popen([executable, '--profile-startup'], env=env,
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            try:
+                result = first_report(process, STARTUP_MEASURE_TIMEOUT)
+                if result is not None:
+                    process.wait(timeout=STARTUP_MEASURE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                result = None
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            if result is None:
+                return None
+            received, report = result
+            launches.append(((received - started) * 1000, report))
+    launch_ms, report = min(launches, key=lambda launch: launch[0])
+    return {'launch_to_first_response_ms': round(launch_ms), 'in_app_ms': report['first_response_ms']}
+
+def build_macos_app_with_tray(fast_launch=False, measure=True):
+    """Build the macOS application with system tray using PyInstaller"""
+
+    # PyInstaller arguments for macOS
+    args = build_args(fast_launch)
+
+    profile = 'Fast-Launch (onedir)' if fast_launch else 'Standard (onefile)'
+    print(f"Building macOS application with System Tray using PyInstaller ({profile})...")
     print("Arguments:", args)
-    
+
     try:
         PyInstaller.__main__.run(args)
         print("\n✓ macOS application with System Tray built successfully!")
         print("You can find the application in the 'dist' folder")
-        print("File: dist/Benutzerverwaltung-Tray.app")
+        print(f"File: dist/{APP_NAME}.app")
         print("\nFeatures:")
         print("- System Tray Icon (Rechtsklick für Menü)")
         print("- Browser öffnet automatisch")
         print("- Beenden über Tray-Menü")
-        return True
     except Exception as e:
         print(f"❌ Error building macOS application: {e}")
         return False
 
+    bundle, executable = built_bundle()
+    print(f"\n📦 Bundle-Größe ({profile}): {bundle_size(bundle) / 1024 / 1024:.1f} MB")
+    if measure:
+        startup = measure_startup(executable) if os.path.isfile(executable) else None
+        if startup:
+            print(f"⏱️  Start bis erste Antwort: {startup['launch_to_first_response_ms']} ms "
+                  f"(davon in der App: {startup['in_app_ms']} ms)")
+        else:
+            print("⚠️  Startzeit konnte nicht gemessen werden")
+    return True
+
 if __name__ == "__main__":
-    success = build_macos_app_with_tray()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Build the macOS application')
+    parser.add_argument('--fast-launch', action='store_true',
+                        help='onedir, ohne ungenutzte Module, gestrippt: schnellerer Start statt Einzeldatei')
+    parser.add_argument('--no-measure', action='store_true', help='Startzeit nach dem Build nicht messen')
+    options = parser.parse_args()
+    if options.fast_launch and not sys.flags.optimize:
+        # PyInstaller 5 compiles the bundled bytecode at the optimization
+        # level of the interpreter running the build
+        sys.exit(subprocess.call([sys.executable, '-O', *sys.argv]))
+    success = build_macos_app_with_tray(options.fast_launch, not options.no_measure)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,187 @@
+"""
+Single-instance handoff between launches of the tray app.
+
+The running instance records its PID, HTTP port and IPC address in a
+runtime state file and listens for commands on a Unix socket (a named
+pipe on Windows, loopback TCP if neither can be created). A second launch
+reads the state file, forwards "open" and exits before importing Flask.
+
+Only the standard library is imported here, so the handoff stays fast.
+"""
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+
+APP_NAME = 'benutzerverwaltung_tray'
+
+# Next to the lock file of create_lock_file() in app.py
+STATE_PATH = os.path.join(tempfile.gettempdir(), f'{APP_NAME}.json')
+
+# Seconds a second launch waits for the IPC reply of the running instance
+FORWARD_TIMEOUT = 2.0
+
+# OpenProcess access right and GetExitCodeProcess result on Windows
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+ERROR_ACCESS_DENIED = 5
+
+def windows_process_exists(pid):
+    """Whether a process with this PID is running, through kernel32 (no psutil needed)"""
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, int(pid))
+    if not handle:
+        # Processes of other users exist but cannot be opened
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def process_exists(pid):
+    """Whether a process with this PID is running (cross-platform)"""
+    if platform.system() == "Windows":
+        try:
+            return windows_process_exists(pid)
+        except (ImportError, AttributeError, OSError):
+            # Without kernel32 treat the state file as stale: no running instance
+            return False
+    try:
+        os.kill(pid, 0)  # Signal 0 just checks if process exists
+        return True
+    except OSError:
+        return False
+
+def ipc_address():
+    """Preferred (family, address) of the command channel on this platform"""
+    if sys.platform == 'win32':
+        return 'AF_PIPE', rf'\\.\pipe\{APP_NAME}-{os.getpid()}'
+    if hasattr(os, 'getuid'):
+        return 'AF_UNIX', os.path.join(tempfile.gettempdir(), f'{APP_NAME}-{os.getuid()}.sock')
+    return 'AF_INET', ('127.0.0.1', 0)
+
+def read_state():
+    """State of the running instance, or None when there is none"""
+    try:
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+        if state['pid'] != os.getpid() and process_exists(state['pid']):
+            return state
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def write_state(port, server):
+    """Record the HTTP port and the command channel of this instance"""
+    state = {
+        'pid': os.getpid(),
+        'port': port,
+        'ipc_family': server.family,
+        'ipc_address': server.address,
+        'authkey': server.authkey.hex(),
+    }
+    # Readable by the current user only, it contains the IPC key
+    fd = os.open(STATE_PATH + '.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+    os.replace(STATE_PATH + '.tmp', STATE_PATH)
+
+def remove_state():
+    """Remove the state file if it belongs to this process"""
+    try:
+        with open(STATE_PATH) as f:
+            if json.load(f).get('pid') != os.getpid():
+                return
+        os.remove(STATE_PATH)
+    except (OSError, ValueError):
+        pass
+
+class InstanceServer:
+    """Accepts commands from later launches and dispatches them to handlers"""
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.authkey = os.urandom(16)
+        self.listener = None
+        self.family = None
+        self.address = None
+
+    def start(self):
+        from multiprocessing.connection import Listener
+        family, address = ipc_address()
+        try:
+            if family == 'AF_UNIX' and os.path.exists(address):
+                # Left behind by an instance that did not shut down cleanly
+                os.remove(address)
+            self.listener = Listener(address, family, authkey=self.authkey)
+        except OSError:
+            family = 'AF_INET'
+            self.listener = Listener(('127.0.0.1', 0), family, authkey=self.authkey)
+        self.family = family
+        self.address = self.listener.address
+        threading.Thread(target=self._serve, name='instance-ipc', daemon=True).start()
+        return self
+
+    def _serve(self):
+        from multiprocessing import AuthenticationError
+        listener = self.listener
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                return  # Listener closed
+            with conn:
+                try:
+                    message = conn.recv()
+                    handler = self.handlers.get(message.get('command'))
+                    reply = handler() if handler else {'ok': False, 'error': 'unknown command'}
+                    conn.send(reply)
+                except (EOFError, OSError, AttributeError):
+                    pass
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+def forward_command(command, state=None, timeout=FORWARD_TIMEOUT):
+    """Send a command to the running instance; returns its reply or None"""
+    state = state or read_state()
+    if state is None:
+        return None
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+    address = state['ipc_address']
+    if state['ipc_family'] == 'AF_INET':
+        address = tuple(address)
+    try:
+        with Client(address, state['ipc_family'], authkey=bytes.fromhex(state['authkey'])) as conn:
+            conn.send({'command': command})
+            if not conn.poll(timeout):
+                return None
+            return conn.recv()
+    except (OSError, EOFError, ValueError, AuthenticationError):
+        return None
+
+def hand_off(argv):
+    """Ask a running instance to open its window; True if this launch can exit"""
+    if '--profile-startup' in argv:
+        return False
+    reply = forward_command('open')
+    if not reply or not reply.get('ok'):
+        return False
+    print(f"✅ Benutzerverwaltung läuft bereits, Browser geöffnet: http://127.0.0.1:{reply['port']}")
+    return True
@@ -1,22 +1,124 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
+
+const compareUsers = (a, b) => {
+  const left = [a.nachname, a.vorname, a.id]
+  const right = [b.nachname, b.vorname, b.id]
+  for (let i = 0; i < left.length; i++) {
+    if (left[i] !== right[i]) {
+      return left[i] < right[i] ? -1 : 1
+    }
+  }
+  return 0
+}
+
+const applyEvent = (users, type, user, { nextCursor, searchQuery }) => {
+  const others = users.filter((other) => other.id !== user.id)
+  if (type === 'deleted') {
+    return others
+  }
+  if (searchQuery) {
+    // Search results are ranked by the server; only refresh shown rows
+    return users.map((other) => (other.id === user.id ? user : other))
+  }
+  // Users sorting after the loaded pages arrive with the next page
+  const last = others[others.length - 1]
+  if (nextCursor && (!last || compareUsers(user, last) > 0)) {
+    return others
+  }
+  const index = others.findIndex((other) => compareUsers(user, other) < 0)
+  return index === -1
+    ? [...others, user]
+    : [...others.slice(0, index), user, ...others.slice(index)]
+}
 
 function App() {
   const [users, setUsers] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [totalCount, setTotalCount] = useState(null)
+  const [searchQuery, setSearchQuery] = useState('')
+  const [connectionLost, setConnectionLost] = useState(false)
+  const listState = useRef({ nextCursor: null, searchQuery: '' })
+  const reloadUsers = useRef(null)
   const [formData, setFormData] = useState({ vorname: '', nachname: '' })
   const [editingId, setEditingId] = useState(null)
   const [message, setMessage] = useState({ text: '', type: '' })
 
   const API_BASE = '/api'
+  const PAGE_SIZE = 100
+  const SEARCH_LIMIT = 50
 
   useEffect(() => {
-    fetchUsers()
+    const timer = setTimeout(() => fetchUsers(), 200)
+    return () => clearTimeout(timer)
+  }, [searchQuery])
+
+  useEffect(() => {
+    listState.current = { nextCursor, searchQuery: searchQuery.trim() }
+  }, [nextCursor, searchQuery])
+
+  // Apply change events from the server instead of reloading the list;
+  // the open stream also serves as connection monitor
+  useEffect(() => {
+    const events = new EventSource(`${API_BASE}/events`)
+    events.onopen = () => setConnectionLost(false)
+    events.onerror = () => setConnectionLost(true)
+    ;['created', 'updated', 'deleted'].forEach((type) => {
+      events.addEventListener(type, (e) => {
+        const user = JSON.parse(e.data)
+        setUsers((current) => applyEvent(current, type, user, listState.current))
+        if (type !== 'updated') {
+          setTotalCount((count) => (count === null ? count : count + (type === 'created' ? 1 : -1)))
+        }
+      })
+    })
+    events.addEventListener('reset', () => reloadUsers.current())
+    return () => events.close()
   }, [])
 
+  const fetchPage = async (cursor) => {
+    const params = new URLSearchParams({ limit: PAGE_SIZE })
+    if (cursor) {
+      params.set('cursor', cursor)
+    }
+    const response = await fetch(`${API_BASE}/users?${params}`)
+    const data = await response.json()
+    return {
+      data,
+      cursor: response.headers.get('X-Next-Cursor'),
+      total: Number(response.headers.get('X-Total-Count')),
+    }
+  }
+
+  const searchUsers = async (query) => {
+    const params = new URLSearchParams({ q: query, limit: SEARCH_LIMIT })
+    const response = await fetch(`${API_BASE}/users/search?${params}`)
+    if (!response.ok) {
+      throw new Error('search failed')
+    }
+    return { data: await response.json(), cursor: null }
+  }
+
   const fetchUsers = async () => {
+    const query = searchQuery.trim()
+    try {
+      const page = query ? await searchUsers(query) : await fetchPage(null)
+      setUsers(page.data)
+      setNextCursor(page.cursor)
+      if (!query) {
+        setTotalCount(page.total)
+      }
+    } catch (error) {
+      showMessage(query ? 'Fehler bei der Suche' : 'Fehler beim Laden der Benutzer', 'error')
+    }
+  }
+  reloadUsers.current = fetchUsers
+
+  const loadMoreUsers = async () => {
     try {
-      const response = await fetch(`${API_BASE}/users`)
-      const data = await response.json()
-      setUsers(data)
+      const page = await fetchPage(nextCursor)
+      setUsers((current) => current.concat(page.data))
+      setNextCursor(page.cursor)
+      setTotalCount(page.total)
     } catch (error) {
       showMessage('Fehler beim Laden der Benutzer', 'error')
     }
@@ -53,7 +155,6 @@ function App() {
         )
         setFormData({ vorname: '', nachname: '' })
         setEditingId(null)
-        fetchUsers()
       } else {
         showMessage('Fehler beim Speichern', 'error')
       }
@@ -79,7 +180,6 @@ function App() {
 
       if (response.ok) {
         showMessage('Benutzer erfolgreich gelöscht', 'success')
-        fetchUsers()
       } else {
         showMessage('Fehler beim Löschen', 'error')
       }
@@ -100,6 +200,12 @@ function App() {
         <p>Einfache Verwaltung von Benutzerdaten</p>
       </div>
 
+      {connectionLost && (
+        <div className="message error">
+          ⚠️ Verbindung zum Server verloren! Die Anwendung wurde möglicherweise beendet.
+        </div>
+      )}
+
       {message.text && (
         <div className={`message ${message.type}`}>
           {message.text}
@@ -141,7 +247,14 @@ function App() {
       </div>
 
       <div className="users-table">
-        <h2>Benutzer ({users.length})</h2>
+        <h2>Benutzer ({searchQuery.trim() || totalCount === null ? users.length : totalCount})</h2>
+        <input
+          type="search"
+          className="search-input"
+          value={searchQuery}
+          onChange={(e) => setSearchQuery(e.target.value)}
+          placeholder="Nach Vor- oder Nachname suchen..."
+        />
         {users.length === 0 ? (
           <p style={{ padding: '20px' }}>Keine Benutzer vorhanden</p>
         ) : (
@@ -181,6 +294,13 @@ function App() {
             </tbody>
           </table>
         )}
+        {nextCursor && (
+          <div style={{ padding: '20px', textAlign: 'center' }}>
+            <button onClick={loadMoreUsers} className="btn btn-secondary">
+              Weitere laden
+            </button>
+          </div>
+        )}
       </div>
     </div>
   )
@@ -3,89 +3,1007 @@ Test script to verify the application works before building exe
 """
 import sqlite3
 import os
+import csv
+import gzip
+import io
+import socket
+import subprocess
+import sys
+import zlib
+import json
 import tempfile
 import requests
 import threading
 import time
-from app_exe import app, init_db, DATABASE
+import uuid
+from contextlib import contextmanager
+import app as app_module
+from app import app, init_db
+
+@contextmanager
+def temp_database():
+    """Point the application at a fresh temporary database"""
+    original = app_module.DATABASE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        app_module.DATABASE = os.path.join(temp_dir, 'users.db')
+        try:
+            app_module.init_db()
+            yield app_module.DATABASE
+        finally:
+            app_module.DATABASE = original
+
+def seed_users(database, names):
+    """Insert (vorname, nachname) pairs directly into the database"""
+    with sqlite3.connect(database) as conn:
+        conn.executemany('INSERT INTO users (id, vorname, nachname) VALUES (?, ?, ?)',
+                         [(f'id-{i:05d}', vorname, nachname) for i, (vorname, nachname) in enumerate(names)])
+        conn.commit()
 
 def test_database():
     """Test database operations"""
     print("Testing database operations...")
     
-    # Initialize database
-    init_db()
+    # Initialize a temporary database, never the user's own
+    with temp_database() as database:
+        # Test connection
+        with sqlite3.connect(database) as conn:
+            # Insert test user
+            user_id = "test-123"
+            conn.execute('INSERT INTO users (id, vorname, nachname) VALUES (?, ?, ?)',
+                         (user_id, 'Test', 'User'))
+            conn.commit()
+            
+            # Retrieve user
+            user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
+            assert user is not None, "User not found"
+            assert user[1] == 'Test', "Wrong vorname"
+            assert user[2] == 'User', "Wrong nachname"
+            
+            # Clean up
+            conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
+            conn.commit()
     
-    # Test connection
-    with sqlite3.connect(DATABASE) as conn:
-        # Insert test user
-        user_id = "test-123"
-        conn.execute('INSERT INTO users (id, vorname, nachname) VALUES (?, ?, ?)',
-                     (user_id, 'Test', 'User'))
-        conn.commit()
+    print("✓ Database operations working")
+
+def test_pagination():
+    """Test keyset pagination of the user listing"""
+    print("Testing pagination...")
+    
+    with temp_database() as database:
+        seed_users(database, [(f'Vorname{i}', f'Nachname{i % 7}') for i in range(25)])
+        client = app.test_client()
         
-        # Retrieve user
-        user = conn.execute('SELECT * FROM users WHERE id = ?', (user_id,)).fetchone()
-        assert user is not None, "User not found"
-        assert user[1] == 'Test', "Wrong vorname"
-        assert user[2] == 'User', "Wrong nachname"
+        seen = []
+        cursor = None
+        while True:
+            url = '/api/users?limit=10' + (f'&cursor={cursor}' if cursor else '')
+            response = client.get(url)
+            assert response.status_code == 200, f"Get page failed: {response.status_code}"
+            page = response.get_json()
+            assert len(page) <= 10, "Page larger than limit"
+            seen.extend(page)
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
         
-        # Clean up
-        conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
-        conn.commit()
+        assert len(seen) == 25, f"Expected 25 users, got {len(seen)}"
+        keys = [(u['nachname'], u['vorname'], u['id']) for u in seen]
+        assert keys == sorted(keys), "Pages not in stable order"
+        
+        response = client.get('/api/users?cursor=kaputt')
+        assert response.status_code == 400, "Invalid cursor should be rejected"
+        response = client.get('/api/users?limit=0')
+        assert response.status_code == 400, "Invalid limit should be rejected"
     
-    print("✓ Database operations working")
+    print("✓ Pagination working")
 
-def test_flask_app():
-    """Test Flask app in a separate thread"""
-    print("Testing Flask application...")
+def test_export():
+    """Test the streaming export in all formats"""
+    print("Testing export...")
     
-    # Start Flask in a thread
-    def run_app():
-        app.run(host='127.0.0.1', port=5001, debug=False)
+    with temp_database() as database:
+        seed_users(database, [(f'Vorname{i}', f'Nachname{i}') for i in range(2500)])
+        client = app.test_client()
+        
+        response = client.get('/api/users/export?format=ndjson')
+        assert response.status_code == 200, f"NDJSON export failed: {response.status_code}"
+        lines = response.get_data(as_text=True).splitlines()
+        assert len(lines) == 2500, f"Expected 2500 NDJSON lines, got {len(lines)}"
+        
+        response = client.get('/api/users/export?format=json')
+        users = response.get_json()
+        assert len(users) == 2500, "JSON export incomplete"
+        assert [json.loads(line) for line in lines] == users, "JSON and NDJSON export differ"
+        
+        response = client.get('/api/users/export?format=csv')
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        assert rows[0] == ['id', 'vorname', 'nachname'], "CSV header missing"
+        assert len(rows) == 2501, "CSV export incomplete"
+        
+        response = client.get('/api/users/export?format=xml')
+        assert response.status_code == 400, "Unknown format should be rejected"
     
-    server_thread = threading.Thread(target=run_app, daemon=True)
-    server_thread.start()
+    print("✓ Export working")
+
+def test_connection_pool():
+    """Test pooled connection reuse and read-only checkouts"""
+    print("Testing connection pool...")
+    
+    with temp_database() as database:
+        pool = app_module.DB_POOL
+        before = pool.stats()
+        
+        conn = app_module.get_db_connection()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal', "WAL not enabled"
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1, "synchronous not NORMAL"
+        conn.close()
+        conn.close()
+        
+        again = app_module.get_db_connection()
+        assert again is conn, "Idle connection not reused"
+        again.close()
+        
+        reader = app_module.get_db_connection(readonly=True)
+        try:
+            reader.execute("INSERT INTO users (id, vorname, nachname) VALUES ('x', 'y', 'z')")
+            assert False, "Read-only connection accepted a write"
+        except sqlite3.OperationalError:
+            pass
+        reader.close()
+        
+        # A failing write inside the transaction still returns its connection
+        client = app.test_client()
+        user_id = client.post('/api/users', json={'vorname': 'Pool', 'nachname': 'Test'}).get_json()['id']
+        with sqlite3.connect(database) as conn:
+            conn.execute("CREATE TRIGGER fail_writes BEFORE UPDATE ON users BEGIN SELECT RAISE(ABORT, 'kaputt'); END")
+            conn.execute("CREATE TRIGGER fail_deletes BEFORE DELETE ON users BEGIN SELECT RAISE(ABORT, 'kaputt'); END")
+        assert client.put(f'/api/users/{user_id}', json={'vorname': 'A', 'nachname': 'B'}).status_code == 500
+        assert client.delete(f'/api/users/{user_id}').status_code == 500
+        writer = app_module.get_db_connection()
+        assert not writer.in_transaction, "Failed write left its transaction open"
+        writer.close()
+        
+        stats = client.get('/api/admin/pool').get_json()
+        assert stats['reused'] > before['reused'], "Reuse not counted"
+        assert stats['in_use'] == before['in_use'], "Connection leaked"
+    
+    print("✓ Connection pool working")
+
+def test_bulk_operations():
+    """Test bulk create, update and delete with per-item results"""
+    print("Testing bulk operations...")
+    
+    with temp_database() as database:
+        client = app.test_client()
+        
+        items = [{'vorname': f'Bulk{i}', 'nachname': 'Import'} for i in range(20000)]
+        items.append({'vorname': 'Ohne Nachname'})
+        response = client.post('/api/users/bulk', json=items)
+        assert response.status_code == 200, f"Bulk create failed: {response.status_code}"
+        result = response.get_json()
+        assert result['succeeded'] == 20000, "Not all valid items created"
+        assert result['results'][-1]['status'] == 400, "Invalid item not reported"
+        print(f"  Bulk create: {result['rows_per_second']} rows/s")
+        created = [r['id'] for r in result['results'] if r['status'] == 201]
+        
+        ndjson = '\n'.join(json.dumps({'id': user_id, 'vorname': 'Neu', 'nachname': 'Name'})
+                           for user_id in created[:3])
+        ndjson += '\n{kaputt\n' + json.dumps({'id': 'gibt-es-nicht', 'vorname': 'a', 'nachname': 'b'})
+        response = client.put('/api/users/bulk', data=ndjson, content_type='application/x-ndjson')
+        statuses = [r['status'] for r in response.get_json()['results']]
+        assert statuses == [200, 200, 200, 400, 404], f"Unexpected update results: {statuses}"
+        
+        response = client.delete('/api/users/bulk', json=created[3:10003] + ['gibt-es-nicht'])
+        result = response.get_json()
+        assert result['succeeded'] == 10000, "Not all users deleted"
+        assert result['results'][-1]['status'] == 404, "Missing id not reported"
+        
+        with sqlite3.connect(database) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 10000, "Wrong row count"
+            renamed = conn.execute("SELECT COUNT(*) FROM users WHERE vorname = 'Neu'").fetchone()[0]
+            assert renamed == 3, "Bulk update not applied"
+    
+    print("✓ Bulk operations working")
+
+def test_search():
+    """Test full-text prefix search with German folding"""
+    print("Testing search...")
+    
+    with temp_database() as database:
+        seed_users(database, [('Jürgen', 'Müller'), ('Anna', 'Mueller'),
+                              ('Hans', 'Strauß'), ('Max', 'Mustermann')])
+        client = app.test_client()
+        
+        def search(query):
+            response = client.get('/api/users/search', query_string={'q': query})
+            assert response.status_code == 200, f"Search failed: {response.status_code}"
+            return sorted(user['nachname'] for user in response.get_json())
+        
+        assert search('mül') == ['Müller'], "Prefix search with umlaut failed"
+        assert search('Mueller') == ['Mueller', 'Müller'], "Umlaut transliteration failed"
+        assert search('strauss') == ['Strauß'], "ß folding failed"
+        assert search('jü mü') == ['Müller'], "Multi-word search failed"
+        assert search('') == [], "Empty search should return nothing"
+        
+        response = client.get('/api/users/search?q=mu&limit=1')
+        assert len(response.get_json()) == 1, "Search limit ignored"
+        assert client.get('/api/users/search?q=mu&limit=viele').status_code == 400, "Invalid limit accepted"
+        
+        user_id = client.post('/api/users', json={'vorname': 'Eva', 'nachname': 'Zander'}).get_json()['id']
+        assert search('zan') == ['Zander'], "Inserted user not indexed"
+        client.put(f'/api/users/{user_id}', json={'vorname': 'Eva', 'nachname': 'Ziegler'})
+        assert search('zan') == [] and search('zieg') == ['Ziegler'], "Update not reindexed"
+        client.delete(f'/api/users/{user_id}')
+        assert search('zieg') == [], "Deleted user still indexed"
+    
+    print("✓ Search working")
+
+def test_conditional_get():
+    """Test ETag revalidation of list and single-user reads"""
+    print("Testing conditional GET...")
+    
+    with temp_database():
+        client = app.test_client()
+        user_id = client.post('/api/users', json={'vorname': 'Etag', 'nachname': 'Test'}).get_json()['id']
+        
+        for url in ('/api/users', f'/api/users/{user_id}'):
+            response = client.get(url)
+            etag = response.headers['ETag']
+            assert response.status_code == 200 and etag, f"No ETag on {url}"
+            
+            response = client.get(url, headers={'If-None-Match': etag})
+            assert response.status_code == 304, f"Expected 304 for {url}, got {response.status_code}"
+            assert response.get_data() == b'', "304 must not have a body"
+        
+        client.put(f'/api/users/{user_id}', json={'vorname': 'Neu', 'nachname': 'Test'})
+        response = client.get('/api/users', headers={'If-None-Match': etag})
+        assert response.status_code == 200, "Stale ETag should return the new data"
+        assert response.headers['ETag'] != etag, "ETag not changed after update"
+        
+        assert client.get('/api/users/gibt-es-nicht').status_code == 404, "Missing user should be 404"
+    
+    print("✓ Conditional GET working")
+
+def test_response_cache():
+    """Test cache hits and range-based invalidation of listing pages"""
+    print("Testing response cache...")
+    
+    with temp_database() as database:
+        seed_users(database, [('Vorname', f'Name{i:02d}') for i in range(30)])
+        client = app.test_client()
+        cache = app_module.RESPONSE_CACHE
+        cache.clear()
+        
+        first = client.get('/api/users?limit=10')
+        cursor = first.headers['X-Next-Cursor']
+        second = client.get(f'/api/users?limit=10&cursor={cursor}')
+        hits = cache.stats()['hits']
+        assert client.get('/api/users?limit=10').get_data() == first.get_data(), "Cached page differs"
+        assert cache.stats()['hits'] == hits + 1, "Second read was not a cache hit"
+        
+        # Names must be text, otherwise they cannot be ordered against cached ranges
+        assert client.post('/api/users', json={'vorname': 1, 'nachname': 2}).status_code == 400, "Number accepted as name"
+        assert client.put('/api/users/id-00001', json={'vorname': 'A', 'nachname': None}).status_code == 400, "null accepted as name"
+        
+        # Name15 lies on the second page only, so the first page stays
+        # cached and is still served under the new ETag
+        client.post('/api/users', json={'vorname': 'Vorname', 'nachname': 'Name15a'})
+        entries = cache.stats()['entries']
+        assert entries == 1, f"Expected only the first page to survive, got {entries} entries"
+        hits = cache.stats()['hits']
+        response = client.get('/api/users?limit=10')
+        assert cache.stats()['hits'] == hits + 1, "Surviving page was not a cache hit after the write"
+        assert response.get_data() == first.get_data(), "Surviving page differs"
+        assert response.headers['ETag'] != first.headers['ETag'], "ETag did not change"
+        page = client.get(f'/api/users?limit=10&cursor={cursor}').get_json()
+        assert 'Name15a' in [user['nachname'] for user in page], "Stale second page served"
+        assert page != second.get_json(), "Second page not refreshed"
+        
+        assert client.get('/api/admin/cache').get_json()['hits'] >= 1, "Stats endpoint broken"
+        
+        # A write that is committed but not yet invalidated must not be
+        # answered with the old body under the new ETag
+        first = client.get('/api/users?limit=10')
+        with sqlite3.connect(database) as conn:
+            conn.execute(app_module.INSERT_USER_SQL, ('id-race', 'Vorname', 'Name00a'))
+            conn.commit()
+        response = client.get('/api/users?limit=10')
+        assert response.headers['ETag'] != first.headers['ETag'], "ETag did not change"
+        assert 'Name00a' in [user['nachname'] for user in response.get_json()], "Old body sent under the new ETag"
+    
+    print("✓ Response cache working")
+
+def test_event_stream():
+    """Test change events and resume via Last-Event-ID"""
+    print("Testing event stream...")
     
-    # Wait for server to start
-    time.sleep(2)
+    with temp_database():
+        client = app.test_client()
+        broker = app_module.EVENTS
+        resume_id = f'{broker.boot_id}-{broker.current()}'
+        
+        user_id = client.post('/api/users', json={'vorname': 'Event', 'nachname': 'Test'}).get_json()['id']
+        client.put(f'/api/users/{user_id}', json={'vorname': 'Event', 'nachname': 'Neu'})
+        client.delete(f'/api/users/{user_id}')
+        
+        response = client.get('/api/events', headers={'Last-Event-ID': resume_id}, buffered=False)
+        assert response.mimetype == 'text/event-stream', "Wrong content type"
+        chunks = (chunk.decode('utf-8') for chunk in response.response)
+        assert next(chunks).startswith('retry:'), "Missing retry hint"
+        replayed = next(chunks)
+        response.close()
+        types = [line.split(': ', 1)[1] for line in replayed.splitlines() if line.startswith('event:')]
+        assert types == ['created', 'updated', 'deleted'], f"Unexpected events: {types}"
+        
+        response = client.get('/api/events', headers={'Last-Event-ID': 'alter-prozess-7'}, buffered=False)
+        chunks = (chunk.decode('utf-8') for chunk in response.response)
+        assert 'event: reset' in next(chunks), "Unknown event id should trigger a reset"
+        response.close()
     
-    base_url = 'http://127.0.0.1:5001'
+    print("✓ Event stream working")
+
+def test_admission_control():
+    """Test fast 503 rejection when a lane is full and the reserved health lane"""
+    print("Testing admission control...")
     
+    with temp_database():
+        client = app.test_client()
+        lanes = app_module.ADMISSION_LANES
+        original = lanes['write']
+        lanes['write'] = app_module.AdmissionLane('write', concurrency=1, queue=0, timeout=0.1)
+        try:
+            assert lanes['write'].try_enter(), "Could not occupy the write lane"
+            response = client.post('/api/users', json={'vorname': 'Zu', 'nachname': 'Viel'})
+            assert response.status_code == 503, f"Expected 503, got {response.status_code}"
+            assert response.headers.get('Retry-After'), "Missing Retry-After header"
+            assert client.get('/api/health').status_code == 200, "Health lane blocked"
+            assert client.get('/api/users').status_code == 200, "Read lane blocked by writes"
+            lanes['write'].leave()
+            
+            response = client.post('/api/users', json={'vorname': 'Wieder', 'nachname': 'Frei'})
+            assert response.status_code == 201, "Lane not released"
+            stats = client.get('/api/admin/admission').get_json()
+            assert stats['write']['rejected'] == 1 and stats['write']['in_flight'] == 0, f"Wrong stats: {stats['write']}"
+        finally:
+            lanes['write'] = original
+        
+        response = client.get('/api/events', buffered=False)
+        assert lanes['stream'].stats()['in_flight'] == 1, "Stream slot not held while streaming"
+        response.close()
+        assert lanes['stream'].stats()['in_flight'] == 0, "Stream slot not released on close"
+    
+    # Event streams get Waitress threads on top of those for normal requests
+    original_streams = lanes['stream'].concurrency
+    server = app_module.create_waitress_server(0, 2, streams=5, connection_limit=10, channel_timeout=7)
     try:
-        # Test home page
-        response = requests.get(f'{base_url}/')
-        assert response.status_code == 200, f"Home page failed: {response.status_code}"
-        assert 'Benutzerverwaltung' in response.text, "Home page content incorrect"
-        
-        # Test API - get users
-        response = requests.get(f'{base_url}/api/users')
-        assert response.status_code == 200, f"Get users failed: {response.status_code}"
-        users = response.json()
-        assert isinstance(users, list), "Users endpoint should return list"
-        
-        # Test API - create user
-        user_data = {'vorname': 'API', 'nachname': 'Test'}
-        response = requests.post(f'{base_url}/api/users', json=user_data)
-        assert response.status_code == 201, f"Create user failed: {response.status_code}"
-        created_user = response.json()
-        user_id = created_user['id']
-        
-        # Test API - update user
-        update_data = {'vorname': 'Updated', 'nachname': 'User'}
-        response = requests.put(f'{base_url}/api/users/{user_id}', json=update_data)
-        assert response.status_code == 200, f"Update user failed: {response.status_code}"
-        
-        # Test API - delete user
-        response = requests.delete(f'{base_url}/api/users/{user_id}')
-        assert response.status_code == 200, f"Delete user failed: {response.status_code}"
-        
-        print("✓ Flask application working")
-        return True
+        assert server.adj.threads == 7, f"Stream threads not added: {server.adj.threads}"
+        assert lanes['stream'].concurrency == 5, "Stream lane not sized to its threads"
+        assert (server.adj.connection_limit, server.adj.channel_timeout) == (10, 7), "Server options ignored"
+    finally:
+        server.close()
+        lanes['stream'].concurrency = original_streams
+    
+    print("✓ Admission control working")
+
+def call_asgi(method, path, body=b'', query_string=b''):
+    """Run one request through the ASGI application and collect the response"""
+    import asyncio
+    from asgi import application
+    
+    async def run():
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = []
         
-    except Exception as e:
-        print(f"❌ Flask test failed: {e}")
-        return False
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(3600)
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+                 'headers': [(b'content-type', b'application/json')], 'http_version': '1.1',
+                 'scheme': 'http', 'server': ('127.0.0.1', 5000), 'client': ('127.0.0.1', 40000)}
+        await application(scope, receive, send)
+        return sent
+    
+    sent = asyncio.run(run())
+    status = sent[0]['status']
+    body = b''.join(message.get('body', b'') for message in sent[1:])
+    return status, body
+
+def test_asgi_application():
+    """Test the ASGI entry point against the same API contract"""
+    print("Testing ASGI application...")
+    
+    with temp_database():
+        status, body = call_asgi('GET', '/api/health')
+        assert status == 200 and json.loads(body)['status'] == 'ok', "ASGI health check failed"
+        
+        status, body = call_asgi('POST', '/api/users', json.dumps({'vorname': 'Asgi', 'nachname': 'Test'}).encode())
+        assert status == 201, f"ASGI create failed: {status}"
+        user_id = json.loads(body)['id']
+        
+        status, body = call_asgi('GET', '/api/users', query_string=b'limit=10')
+        assert status == 200 and [u['id'] for u in json.loads(body)] == [user_id], "ASGI listing wrong"
+        
+        status, body = call_asgi('GET', '/api/users/export', query_string=b'format=ndjson')
+        assert status == 200 and json.loads(body)['id'] == user_id, "ASGI streamed export wrong"
+    
+    print("✓ ASGI application working")
+
+def test_static_assets():
+    """Test precompressed, cacheable delivery of the page and Vite assets"""
+    print("Testing static assets...")
+    
+    original_dir = app_module.FRONTEND_DIST_DIR
+    with tempfile.TemporaryDirectory() as dist_dir:
+        os.makedirs(os.path.join(dist_dir, 'assets'))
+        with open(os.path.join(dist_dir, 'index.html'), 'w') as f:
+            f.write('<!DOCTYPE html><title>Benutzerverwaltung</title>' + '<div></div>' * 100)
+        script = 'console.log("Benutzerverwaltung");' * 100
+        with open(os.path.join(dist_dir, 'assets', 'index-4f2a9c.js'), 'w') as f:
+            f.write(script)
+        
+        app_module.FRONTEND_DIST_DIR = dist_dir
+        app_module.STATIC_ASSETS = None
+        try:
+            client = app.test_client()
+            
+            response = client.get('/assets/index-4f2a9c.js', headers={'Accept-Encoding': 'gzip'})
+            assert response.status_code == 200, f"Asset failed: {response.status_code}"
+            assert response.headers['Content-Encoding'] == 'gzip', "Asset not served gzipped"
+            assert 'immutable' in response.headers['Cache-Control'], "Hashed asset not immutable"
+            assert gzip.decompress(response.get_data()).decode() == script, "Wrong gzip content"
+            
+            response = client.get('/assets/index-4f2a9c.js')
+            assert 'Content-Encoding' not in response.headers, "Encoding without Accept-Encoding"
+            assert response.get_data(as_text=True) == script, "Wrong identity content"
+            
+            response = client.get('/', headers={'Accept-Encoding': 'gzip'})
+            etag = response.headers['ETag']
+            response = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+            assert response.status_code == 304, "Page not revalidated with 304"
+            
+            assert client.get('/assets/fehlt.js').status_code == 404, "Missing asset should be 404"
+        finally:
+            app_module.FRONTEND_DIST_DIR = original_dir
+            app_module.STATIC_ASSETS = None
+    
+    response = app.test_client().get('/')
+    assert 'Benutzerverwaltung' in response.get_data(as_text=True), "Embedded page not served"
+    
+    print("✓ Static assets working")
+
+def test_api_compression():
+    """Test Accept-Encoding negotiation for JSON and streamed API responses"""
+    print("Testing API compression...")
+    
+    with temp_database() as database:
+        seed_users(database, [('Vorname', f'Name{i:03d}') for i in range(200)])
+        client = app.test_client()
+        
+        plain = client.get('/api/users')
+        response = client.get('/api/users', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip', "List not gzipped"
+        assert 'Accept-Encoding' in response.headers['Vary'], "Missing Vary: Accept-Encoding"
+        assert gzip.decompress(response.get_data()) == plain.get_data(), "Wrong gzip content"
+        assert response.headers['ETag'] != plain.headers['ETag'], "Encoded ETag must differ"
+        
+        revalidated = client.get('/api/users', headers={'Accept-Encoding': 'gzip',
+                                                        'If-None-Match': response.headers['ETag']})
+        assert revalidated.status_code == 304, "Compressed ETag not revalidated"
+        
+        response = client.get('/api/users', headers={'Accept-Encoding': 'deflate'})
+        assert response.headers['Content-Encoding'] == 'deflate', "List not deflated"
+        assert zlib.decompress(response.get_data()) == plain.get_data(), "Wrong deflate content"
+        
+        response = client.get('/api/health', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers, "Small response should stay uncompressed"
+        
+        response = client.get('/api/users/export?format=csv', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip', "Export stream not gzipped"
+        rows = list(csv.reader(io.StringIO(gzip.decompress(response.get_data()).decode('utf-8'))))
+        assert len(rows) == 201, f"Expected header + 200 rows, got {len(rows)}"
+        
+        stats = client.get('/api/admin/compression').get_json()['routes']
+        assert stats['/api/users']['bytes_saved'] > 0, "No bytes saved recorded"
+        assert stats['/api/health']['skipped'] >= 1, "Skipped response not counted"
+    
+    # Levels zlib rejects fall back to the default instead of failing every response
+    try:
+        for value, expected in (('12', 6), ('schnell', 6), ('-1', -1), ('9', 9)):
+            os.environ['BENUTZERVERWALTUNG_COMPRESSION_LEVEL'] = value
+            level = app_module.env_number('BENUTZERVERWALTUNG_COMPRESSION_LEVEL', 6, int, -1, 9)
+            assert level == expected, f"Level {value!r} read as {level}"
+    finally:
+        del os.environ['BENUTZERVERWALTUNG_COMPRESSION_LEVEL']
+    
+    print("✓ API compression working")
+
+def test_sql_json_encoding():
+    """Test that SQL-side JSON encoding matches the Python encoder"""
+    print("Testing SQL-side JSON encoding...")
+    
+    with temp_database() as database:
+        seed_users(database, [('Jürgen', 'Mül"ler\\'), ('Zoë', 'Strauß'), ('Anna', 'Tab\tName')]
+                   + [('Vorname', f'Name{i:02d}') for i in range(20)])
+        client = app.test_client()
+        assert app_module.JSON_SQL_AVAILABLE, "SQLite JSON functions missing"
+        
+        def fetch_all():
+            results = {}
+            for url in ('/api/users?limit=10', '/api/users?limit=1000',
+                        '/api/users/export?format=json', '/api/users/export?format=ndjson'):
+                app_module.RESPONSE_CACHE.clear()
+                response = client.get(url)
+                if 'ndjson' in url:
+                    results[url] = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+                else:
+                    results[url] = (response.get_json(), response.headers.get('X-Next-Cursor'))
+            return results
+        
+        encoded_in_sql = fetch_all()
+        app_module.JSON_SQL_AVAILABLE = False
+        try:
+            encoded_in_python = fetch_all()
+        finally:
+            app_module.JSON_SQL_AVAILABLE = True
+        
+        assert encoded_in_sql == encoded_in_python, "SQL and Python encoding differ"
+        users = encoded_in_sql['/api/users?limit=1000'][0]
+        assert {'vorname': 'Jürgen', 'nachname': 'Mül"ler\\'} in [
+            {k: u[k] for k in ('vorname', 'nachname')} for u in users], "Special characters not preserved"
+    
+    print("✓ SQL-side JSON encoding working")
+
+def test_startup_readiness():
+    """Test the ready signal of the server thread and early requests during init_db"""
+    print("Testing startup readiness...")
+    
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    
+    ready = threading.Event()
+    servers = []
+    server_thread = threading.Thread(target=app_module.run_flask, args=(port, 'werkzeug', None, ready, servers),
+                                     daemon=True)
+    server_thread.start()
+    assert ready.wait(5), "Server thread did not signal readiness"
+    try:
+        assert app_module.wait_until_accepting(port, timeout=1), "Port not accepting after ready signal"
+    finally:
+        servers[0].shutdown()
+        server_thread.join(5)
+    assert not server_thread.is_alive(), "Server thread still running after shutdown"
+    
+    client = app.test_client()
+    original_timeout = app_module.DATABASE_READY_TIMEOUT
+    app_module.DATABASE_READY_TIMEOUT = 0.05
+    app_module.DATABASE_READY.clear()
+    try:
+        response = client.get('/api/health')
+        assert response.status_code == 503, f"Expected 503 before init_db, got {response.status_code}"
+        
+        threading.Timer(0.02, app_module.DATABASE_READY.set).start()
+        app_module.DATABASE_READY_TIMEOUT = 5
+        assert client.get('/api/health').status_code == 200, "Request not released after init_db"
+    finally:
+        app_module.DATABASE_READY_TIMEOUT = original_timeout
+        app_module.DATABASE_READY.set()
+    
+    print("✓ Startup readiness working")
+
+def test_startup_budget():
+    """Test that a fresh process answers its first HTTP request within the startup budget"""
+    print("Testing startup budget...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Keep the child process away from the real database in the home directory
+        env = dict(os.environ, BENUTZERVERWALTUNG_DATABASE=os.path.join(temp_dir, 'users.db'))
+        result = subprocess.run([sys.executable, app_module.__file__, '--profile-startup', '--server', 'waitress'],
+                                capture_output=True, text=True, timeout=60, env=env)
+        assert os.path.exists(env['BENUTZERVERWALTUNG_DATABASE']), "Database override ignored"
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"  First response after {report['first_response_ms']} ms (budget {report['budget_ms']} ms)")
+    assert report['status'] == 200, f"First request failed: {report['status']}"
+    assert report['within_budget'], f"Startup over budget: {report['phases_ms']}"
+    assert result.returncode == 0, "Profiler should exit 0 within budget"
+    assert not report['deferred_modules_loaded']['pystray'], "pystray imported without tray"
+    assert not report['deferred_modules_loaded']['webbrowser'], "webbrowser imported without browser"
+    
+    print("✓ Startup budget working")
+
+def test_instance_handoff():
+    """Test the runtime state file and the IPC command channel between launches"""
+    print("Testing single-instance handoff...")
+    
+    import instance
+    original_state_path, original_address = instance.STATE_PATH, instance.ipc_address
+    with tempfile.TemporaryDirectory() as temp_dir:
+        instance.STATE_PATH = os.path.join(temp_dir, 'state.json')
+        if hasattr(socket, 'AF_UNIX'):
+            instance.ipc_address = lambda: ('AF_UNIX', os.path.join(temp_dir, 'ipc.sock'))
+        server = instance.InstanceServer({'open': lambda: {'ok': True, 'port': 5123}}).start()
+        try:
+            instance.write_state(5123, server)
+            with open(instance.STATE_PATH) as f:
+                state = json.load(f)
+            assert state['port'] == 5123 and state['pid'] == os.getpid(), "Wrong runtime state"
+            assert instance.read_state() is None, "Own state must not count as a running instance"
+            
+            started = time.perf_counter()
+            reply = instance.forward_command('open', state=state)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            assert reply == {'ok': True, 'port': 5123}, f"Unexpected reply: {reply}"
+            print(f"  Handoff round trip: {elapsed_ms:.1f} ms")
+            
+            assert not instance.forward_command('beenden', state=state)['ok'], "Unknown command accepted"
+            forged = dict(state, authkey='00' * 16)
+            assert instance.forward_command('open', state=forged) is None, "Wrong key accepted"
+            
+            instance.remove_state()
+            assert not os.path.exists(instance.STATE_PATH), "State file not removed"
+        finally:
+            server.close()
+            instance.STATE_PATH, instance.ipc_address = original_state_path, original_address
+    
+    print("✓ Single-instance handoff working")
+
+def test_metrics():
+    """Test request histograms, byte counters and gauges at /api/metrics"""
+    print("Testing metrics...")
+    
+    def sample(text, line_prefix):
+        values = [float(line.rsplit(' ', 1)[1]) for line in text.splitlines() if line.startswith(line_prefix)]
+        return values[0] if values else 0.0
+    
+    with temp_database() as database:
+        seed_users(database, [('Vorname', f'Name{i:03d}') for i in range(50)])
+        client = app.test_client()
+        before = client.get('/api/metrics').get_data(as_text=True)
+        
+        count_prefix = 'benutzerverwaltung_http_request_duration_seconds_count{route="/api/users",method="GET",status="200"}'
+        for _ in range(3):
+            client.get('/api/users')
+        client.get('/api/users/gibt-es-nicht')
+        # The byte count is final once the server closes the streamed body
+        with client.get('/api/users/export?format=ndjson') as response:
+            export = response.get_data()
+        
+        response = client.get('/api/metrics')
+        assert response.status_code == 200, f"Metrics failed: {response.status_code}"
+        assert response.mimetype == 'text/plain', "Wrong metrics content type"
+        text = response.get_data(as_text=True)
+        
+        assert sample(text, count_prefix) - sample(before, count_prefix) == 3, "List requests not counted"
+        assert sample(text, 'benutzerverwaltung_http_request_duration_seconds_count{route="/api/users/<user_id>",method="GET",status="404"}') >= 1, \
+            "404 not counted under its route pattern"
+        assert sample(text, 'benutzerverwaltung_sqlite_seconds_per_request_sum{route="/api/users",method="GET"}') > 0, \
+            "SQLite time not recorded"
+        export_prefix = 'benutzerverwaltung_http_response_bytes_total{route="/api/users/export"}'
+        assert sample(text, export_prefix) - sample(before, export_prefix) == len(export), "Streamed bytes not counted"
+        assert sample(text, 'benutzerverwaltung_http_requests_in_flight{route="/api/users"}') == 0, "In-flight gauge leaked"
+        assert sample(text, 'benutzerverwaltung_http_requests_in_flight{route="/api/metrics"}') == 1, \
+            "Metrics request not in flight"
+    
+    print("✓ Metrics working")
+
+def test_query_tracing():
+    """Test statement aggregation and the slow-query log with query plans"""
+    print("Testing query tracing...")
+    
+    assert app_module.normalize_sql("SELECT * FROM t WHERE a = 'x''y' AND b = 42  LIMIT 10") == \
+        'SELECT * FROM t WHERE a = ? AND b = ? LIMIT ?', "Literals not normalized"
+    
+    with temp_database() as database:
+        seed_users(database, [('Vorname', f'Name{i:03d}') for i in range(50)])
+        client = app.test_client()
+        app_module.RESPONSE_CACHE.clear()
+        
+        response = client.post('/api/admin/queries', json={'enabled': True, 'slow_ms': 0, 'reset': True})
+        assert response.get_json()['enabled'], "Tracing not enabled"
+        try:
+            client.get('/api/users?limit=10')
+            client.get('/api/users/id-00001')
+            client.post('/api/users', json={'vorname': 'Neu', 'nachname': 'Person'})
+            stats = client.get('/api/admin/queries?top=50').get_json()
+        finally:
+            client.post('/api/admin/queries', json={'enabled': False, 'slow_ms': app_module.SLOW_QUERY_MS, 'reset': True})
+        
+        by_sql = {entry['sql']: entry for entry in stats['top']}
+        listing = next(entry for sql, entry in by_sql.items() if 'ORDER BY nachname, vorname, id LIMIT ?' in sql)
+        assert listing['calls'] == 1 and listing['rows'] == 11, f"Wrong listing stats: {listing}"
+        assert any(sql.startswith('INSERT INTO users') for sql in by_sql), "INSERT not traced"
+        
+        plans = [entry['plan'] for entry in stats['slow'] if 'ORDER BY nachname' in entry['sql'] and entry['plan']]
+        assert plans and any('idx_users_name_order' in step for step in plans[0]), f"Query plan missing: {plans}"
+        with open(os.path.join(os.path.dirname(database), 'slow_queries.log')) as f:
+            assert len(f.readlines()) >= len(stats['slow']), "Slow-query log file not written"
+        
+        assert client.get('/api/admin/queries?sort=langsam').status_code == 400, "Unknown sort accepted"
+        client.get('/api/users?limit=5')
+        assert client.get('/api/admin/queries').get_json()['statements'] == 0, "Traced while disabled"
+    
+    print("✓ Query tracing working")
+
+def test_request_profiler():
+    """Test armed and header-triggered request profiles stored as pstats"""
+    print("Testing request profiler...")
+    
+    import pstats
+    with temp_database() as database:
+        seed_users(database, [('Vorname', f'Name{i:03d}') for i in range(20)])
+        client = app.test_client()
+        
+        assert client.post('/api/admin/profiler', json={'route': '/api/gibt-es-nicht'}).status_code == 400, \
+            "Unknown route accepted"
+        response = client.post('/api/admin/profiler', json={'route': '/api/users', 'count': 2})
+        assert response.get_json()['armed'] == {'/api/users': 2}, "Route not armed"
+        
+        # Requests arriving while another profile runs keep the armed count
+        with app_module.PROFILER._active:
+            client.get('/api/users').close()
+        assert app_module.PROFILER.armed == {'/api/users': 2}, "Skipped request used up the armed count"
+        
+        # A capture is stored once the server closes the response body
+        for _ in range(3):
+            client.get('/api/users').close()
+        client.get('/api/users/id-00001').close()
+        # The header is ignored until header mode is switched on
+        client.get('/api/health', headers={'X-Profile': '1'}).close()
+        assert client.post('/api/admin/profiler', json={'header': True}).get_json()['header'], "Header mode not on"
+        client.get('/api/health', headers={'X-Profile': '1'}).close()
+        
+        status = client.get('/api/admin/profiler').get_json()
+        routes = sorted(capture['route'] for capture in status['captures'])
+        assert routes == ['/api/health', '/api/users', '/api/users'], f"Unexpected captures: {routes}"
+        assert status['armed'] == {}, "Armed count not used up"
+        assert client.delete('/api/admin/profiler').get_json()['header'] is False, "Disarm kept header mode"
+        capture = next(capture for capture in status['captures'] if capture['route'] == '/api/users')
+        assert capture['status'] == 200 and capture['top'], "Capture summary incomplete"
+        
+        response = client.get(f"/api/admin/profiler/{capture['file']}")
+        assert response.status_code == 200, "Profile download failed"
+        stats = pstats.Stats(os.path.join(status['directory'], capture['file']))
+        assert any(func[2] == 'get_users' for func in stats.stats), "View function missing from profile"
+    
+    print("✓ Request profiler working")
+
+def test_schema_migration():
+    """Test the batched migration of a legacy database to BLOB ids"""
+    print("Testing schema migration...")
+    
+    ids = ['3f0c7a52-8a7e-4b1e-9a61-1d2c3b4a5e6f', '0b7e1a2c-5d4f-4e3a-8b9c-7d6e5f4a3b2c',
+           '9d8c7b6a-5e4f-4a3b-8c2d-1e0f9a8b7c6d', 'legacy-1', 'A1B2C3D4-E5F6-4A7B-8C9D-0E1F2A3B4C5D']
+    names = [('Anna', 'Meier'), ('Ben', 'Meier'), ('Carl', 'Zander'), ('Dora', 'Meier'), ('Emil', 'Abel')]
+    original_database, original_batch_size = app_module.DATABASE, app_module.MIGRATION_BATCH_SIZE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        app_module.DATABASE = os.path.join(temp_dir, 'legacy.db')
+        app_module.MIGRATION_BATCH_SIZE = 2
+        try:
+            # Layout before schema versions existed
+            with sqlite3.connect(app_module.DATABASE) as conn:
+                conn.execute('CREATE TABLE users (id TEXT PRIMARY KEY, vorname TEXT NOT NULL, nachname TEXT NOT NULL)')
+                conn.execute('CREATE INDEX idx_users_name_order ON users (nachname, vorname, id)')
+                conn.executemany('INSERT INTO users (id, vorname, nachname) VALUES (?, ?, ?)',
+                                 [(user_id, vorname, nachname) for user_id, (vorname, nachname) in zip(ids, names)])
+                conn.commit()
+                # An earlier run that stopped after the first batch
+                app_module.start_users_migration(conn)
+                app_module.copy_legacy_users(conn, 2)
+                conn.commit()
+                # Another tool changes already copied rows before the next run
+                conn.execute("UPDATE users SET vorname = 'Anja' WHERE id = ?", (ids[0],))
+                conn.execute('DELETE FROM users WHERE id = ?', (ids[1],))
+                conn.execute("INSERT INTO users (id, vorname, nachname) VALUES ('legacy-2', 'Fritz', 'Abel')")
+                conn.commit()
+            names[0] = ('Anja', 'Meier')
+            del ids[1], names[1]
+            ids.append('legacy-2')
+            names.append(('Fritz', 'Abel'))
+            
+            init_db()
+            with sqlite3.connect(app_module.DATABASE) as conn:
+                assert conn.execute('PRAGMA user_version').fetchone()[0] == app_module.SCHEMA_VERSION, "Version not set"
+                table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'users'").fetchone()[0]
+                assert 'WITHOUT ROWID' in table_sql, "users not rebuilt"
+                types = dict(conn.execute('SELECT id, typeof(id) FROM users').fetchall())
+                assert list(types.values()).count('blob') == 2, f"UUIDs not stored as 16 bytes: {types}"
+                assert types['legacy-1'] == 'text', "Legacy id not kept as text"
+                leftovers = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE name LIKE 'users_v1%'"
+                ).fetchall()
+                assert leftovers == [], f"Migration leftovers: {leftovers}"
+            
+            client = app.test_client()
+            expected = sorted(zip(ids, names), key=lambda item: (item[1][1], item[1][0]))
+            listed = []
+            url = '/api/users?limit=2'
+            while url:
+                response = client.get(url)
+                listed += response.get_json()
+                url = response.headers.get('Link', '').partition('<')[2].partition('>')[0]
+            assert [user['id'] for user in listed] == [user_id for user_id, _ in expected], f"Wrong listing: {listed}"
+            
+            response = client.get(f'/api/users/{ids[0]}')
+            assert response.get_json() == {'id': ids[0], 'vorname': 'Anja', 'nachname': 'Meier'}, "Change after the first batch lost"
+            assert client.get('/api/users/0b7e1a2c-5d4f-4e3a-8b9c-7d6e5f4a3b2c').status_code == 404, \
+                "Row deleted after the first batch came back"
+            assert client.get(f'/api/users/{ids[3]}').status_code == 200, "Non-canonical legacy id lost"
+            assert client.get('/api/users/count').get_json()['count'] == len(ids), "Migrated count wrong"
+            assert [user['id'] for user in client.get('/api/users/search?q=zand').get_json()] == [ids[1]], \
+                "Search index not carried over"
+            
+            user_id = client.post('/api/users', json={'vorname': 'Neu', 'nachname': 'Abel'}).get_json()['id']
+            assert client.put(f'/api/users/{user_id}', json={'vorname': 'Neu', 'nachname': 'Zander'}).status_code == 200
+            assert len(client.get('/api/users/search?q=zand').get_json()) == 2, "New user not indexed"
+            export = client.get('/api/users/export?format=csv').get_data(as_text=True)
+            assert user_id in export and ids[1] in export, "Export lost the canonical ids"
+            assert client.delete(f'/api/users/{user_id}').status_code == 200, "Delete failed"
+            
+            # Running init_db() again leaves a migrated database alone
+            init_db()
+            assert len(client.get('/api/users').get_json()) == len(ids), "Second init_db() changed the data"
+            
+            # A schema from a newer version keeps the server from touching the data
+            with sqlite3.connect(app_module.DATABASE) as conn:
+                conn.execute(f'PRAGMA user_version = {app_module.SCHEMA_VERSION + 1}')
+            app_module.DATABASE_READY.clear()
+            app_module.prepare_database(app_module.StartupTimer(verbose=False))
+            assert app_module.DATABASE_READY.is_set(), "Requests still held after the failed init_db()"
+            response = client.get('/api/users')
+            assert response.status_code == 503, f"Newer schema served: {response.status_code}"
+            assert 'neuer' in response.get_json()['error'], "Reason not reported"
+            assert client.post('/api/users', json={'vorname': 'A', 'nachname': 'B'}).status_code == 503, \
+                "Write accepted on a newer schema"
+        finally:
+            app_module.DATABASE, app_module.MIGRATION_BATCH_SIZE = original_database, original_batch_size
+            app_module.DATABASE_ERROR = None
+    
+    print("✓ Schema migration working")
+
+def test_time_ordered_ids():
+    """Test UUIDv7 generation and that random v4 ids keep working"""
+    print("Testing time-ordered ids...")
+    
+    generator = app_module.UuidV7Generator()
+    per_thread = [[] for _ in range(4)]
+    
+    def generate(ids):
+        for _ in range(5000):
+            ids.append(generator())
+    
+    threads = [threading.Thread(target=generate, args=(ids,)) for ids in per_thread]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    all_ids = [value for ids in per_thread for value in ids]
+    assert len(set(all_ids)) == len(all_ids), "Duplicate ids across threads"
+    assert all(value.version == 7 for value in all_ids), "Wrong UUID version"
+    for ids in per_thread:
+        assert all(a.bytes < b.bytes for a, b in zip(ids, ids[1:])), "Ids not monotonic"
+    
+    # A full counter moves on to the next millisecond instead of wrapping
+    generator._last_ms, generator._counter = time.time_ns() // 1_000_000 + 60000, 0xFFF
+    previous = generator._last_ms
+    assert generator().int >> 80 == previous + 1, "Counter overflow not carried into the timestamp"
+    
+    with temp_database() as database:
+        client = app.test_client()
+        user_id = client.post('/api/users', json={'vorname': 'Zeit', 'nachname': 'Ordnung'}).get_json()['id']
+        assert uuid.UUID(user_id).version == 7, "New users do not get time-ordered ids"
+        
+        legacy_id = str(uuid.uuid4())
+        with sqlite3.connect(database) as conn:
+            conn.execute(app_module.INSERT_USER_SQL, (app_module.user_id_to_db(legacy_id), 'Alt', 'Bestand'))
+            conn.commit()
+        assert client.get(f'/api/users/{legacy_id}').get_json()['id'] == legacy_id, "v4 id lookup failed"
+        assert client.put(f'/api/users/{legacy_id}', json={'vorname': 'Alt', 'nachname': 'Neu'}).status_code == 200
+        assert {user['id'] for user in client.get('/api/users').get_json()} == {user_id, legacy_id}
+        assert client.delete(f'/api/users/{legacy_id}').status_code == 200, "v4 id delete failed"
+    
+    print("✓ Time-ordered ids working")
+
+def test_user_count():
+    """Test the trigger-maintained user count and the X-Total-Count header"""
+    print("Testing user count...")
+    
+    with temp_database() as database:
+        seed_users(database, [('Anna', 'Meier'), ('Ben', 'Schulz'), ('Carl', 'Weber')])
+        client = app.test_client()
+        
+        def count():
+            response = client.get('/api/users/count')
+            assert response.status_code == 200, f"Count failed: {response.status_code}"
+            return response.get_json()['count']
+        
+        assert count() == 3, "Seeded users not counted"
+        response = client.get('/api/users?limit=1')
+        assert response.headers['X-Total-Count'] == '3', "Missing total on list response"
+        assert len(response.get_json()) == 1, "Page size ignored"
+        
+        user_id = client.post('/api/users', json={'vorname': 'Dora', 'nachname': 'Zander'}).get_json()['id']
+        client.put(f'/api/users/{user_id}', json={'vorname': 'Dora', 'nachname': 'Abel'})
+        assert count() == 4, "Create or update miscounted"
+        
+        created = [result['id'] for result in client.post('/api/users/bulk', json=[
+            {'vorname': 'Bulk', 'nachname': f'Test{i}'} for i in range(50)
+        ]).get_json()['results']]
+        assert count() == 54, "Bulk create not counted"
+        client.delete('/api/users/bulk', json=created[:20] + ['gibt-es-nicht'])
+        client.delete(f'/api/users/{user_id}')
+        assert count() == 33, "Deletes not counted"
+        
+        # Served from the cache, the listing still reports the current total
+        client.get('/api/users?limit=1')
+        client.post('/api/users', json={'vorname': 'Eva', 'nachname': 'Zz'})
+        assert client.get('/api/users?limit=1').headers['X-Total-Count'] == '34', "Stale total from the cache"
+        
+        response = client.get('/api/users/count')
+        revalidated = client.get('/api/users/count', headers={'If-None-Match': response.headers['ETag']})
+        assert revalidated.status_code == 304, "Count not revalidated by ETag"
+        
+        with sqlite3.connect(database) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 34, "Counter drifted from the table"
+    
+    print("✓ User count working")
+
+def test_flask_app():
+    """Test Flask app in a separate thread"""
+    print("Testing Flask application...")
+    
+    # Serve a temporary database, never the user's own
+    with temp_database():
+        # Start Flask in a thread
+        def run_app():
+            app.run(host='127.0.0.1', port=5001, debug=False)
+        
+        server_thread = threading.Thread(target=run_app, daemon=True)
+        server_thread.start()
+        
+        # Wait for server to start
+        time.sleep(2)
+        
+        base_url = 'http://127.0.0.1:5001'
+        
+        try:
+            # Test home page
+            response = requests.get(f'{base_url}/')
+            assert response.status_code == 200, f"Home page failed: {response.status_code}"
+            assert 'Benutzerverwaltung' in response.text, "Home page content incorrect"
+        
+            # Test API - get users
+            response = requests.get(f'{base_url}/api/users')
+            assert response.status_code == 200, f"Get users failed: {response.status_code}"
+            users = response.json()
+            assert isinstance(users, list), "Users endpoint should return list"
+        
+            # Test API - create user
+            user_data = {'vorname': 'API', 'nachname': 'Test'}
+            response = requests.post(f'{base_url}/api/users', json=user_data)
+            assert response.status_code == 201, f"Create user failed: {response.status_code}"
+            created_user = response.json()
+            user_id = created_user['id']
+        
+            # Test API - update user
+            update_data = {'vorname': 'Updated', 'nachname': 'User'}
+            response = requests.put(f'{base_url}/api/users/{user_id}', json=update_data)
+            assert response.status_code == 200, f"Update user failed: {response.status_code}"
+        
+            # Test API - delete user
+            response = requests.delete(f'{base_url}/api/users/{user_id}')
+            assert response.status_code == 200, f"Delete user failed: {response.status_code}"
+        
+            print("✓ Flask application working")
+            return True
+        
+        except Exception as e:
+            print(f"❌ Flask test failed: {e}")
+            return False
 
 def run_tests():
     """Run all tests"""
@@ -95,6 +1013,28 @@ def run_tests():
     
     try:
         test_database()
+        test_pagination()
+        test_export()
+        test_connection_pool()
+        test_bulk_operations()
+        test_search()
+        test_conditional_get()
+        test_response_cache()
+        test_event_stream()
+        test_admission_control()
+        test_asgi_application()
+        test_static_assets()
+        test_api_compression()
+        test_sql_json_encoding()
+        test_startup_readiness()
+        test_startup_budget()
+        test_instance_handoff()
+        test_metrics()
+        test_query_tracing()
+        test_request_profiler()
+        test_schema_migration()
+        test_time_ordered_ids()
+        test_user_count()
         flask_success = test_flask_app()
         
         print("\n" + "=" * 50)